@@ -0,0 +1,159 @@
+"""Per-namespace cache hit, latency and payload size metrics."""
+import bisect
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+# Histogram bucket upper bounds, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+SIZE_BUCKETS_BYTES = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def key_namespace(key: str) -> str:
+    """The namespace of a key is the part before the first colon."""
+    return key.split(":", 1)[0]
+
+
+class Histogram:
+    """Fixed-bucket histogram with count and sum."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of observations."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "avg": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class HotKeySampler:
+    """Approximate most frequently read keys from a random sample of reads.
+
+    Sampled keys are counted with the Space-Saving algorithm, so memory
+    stays bounded by capacity however many distinct keys are read.
+    """
+
+    def __init__(self, capacity: int, sample_rate: float):
+        self.capacity = capacity
+        self.sample_rate = sample_rate
+        self.counts: Dict[str, int] = {}
+
+    def observe(self, key: str):
+        if random.random() >= self.sample_rate:
+            return
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0) + 1
+            return
+        # Replace the least counted key, inheriting its count as an error bound
+        coldest = min(self.counts, key=self.counts.get)
+        self.counts[key] = self.counts.pop(coldest) + 1
+
+    def top(self, count: int) -> List[Dict[str, Any]]:
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:count]
+        return [
+            {"key": key, "sampled_reads": sampled, "estimated_reads": round(sampled / self.sample_rate)}
+            for key, sampled in ranked
+        ]
+
+
+class NamespaceMetrics:
+    """Counters and histograms for one key namespace."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.writes = 0
+        self.latency_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.value_bytes = Histogram(SIZE_BUCKETS_BYTES)
+
+    def snapshot(self) -> Dict[str, Any]:
+        reads = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / reads if reads else 0.0,
+            "errors": self.errors,
+            "writes": self.writes,
+            "latency_ms": self.latency_ms.snapshot(),
+            "value_bytes": self.value_bytes.snapshot(),
+        }
+
+
+class CacheMetrics:
+    """Hits, misses, errors, round-trip latency and value sizes per key namespace."""
+
+    def __init__(self, hot_key_capacity: int = 100, hot_key_sample_rate: float = 0.01):
+        self.namespaces: Dict[str, NamespaceMetrics] = {}
+        self.hot_keys = HotKeySampler(hot_key_capacity, hot_key_sample_rate)
+
+    def _namespace(self, key: str) -> NamespaceMetrics:
+        namespace = key_namespace(key)
+        metrics = self.namespaces.get(namespace)
+        if metrics is None:
+            metrics = self.namespaces[namespace] = NamespaceMetrics()
+        return metrics
+
+    def record_read(self, key: str, raw: Optional[bytes]):
+        """Record a read of key that returned raw, None on a miss."""
+        metrics = self._namespace(key)
+        if raw is None:
+            metrics.misses += 1
+        else:
+            metrics.hits += 1
+            metrics.value_bytes.observe(len(raw))
+        self.hot_keys.observe(key)
+
+    def record_write(self, key: str, raw: bytes):
+        """Record a write of an encoded value."""
+        metrics = self._namespace(key)
+        metrics.writes += 1
+        metrics.value_bytes.observe(len(raw))
+
+    def record_latency(self, keys: Sequence[str], seconds: float):
+        """Record one round-trip against every namespace it touched."""
+        for namespace in {key_namespace(key) for key in keys}:
+            self._namespace(namespace).latency_ms.observe(seconds * 1000)
+
+    def record_error(self, keys: Sequence[str]):
+        """Record a failed command against every namespace it touched."""
+        for namespace in {key_namespace(key) for key in keys}:
+            self._namespace(namespace).errors += 1
+
+    def get_metrics(self, hot_keys: int = 20) -> Dict[str, Any]:
+        """Get per-namespace metrics and the hottest sampled keys."""
+        return {
+            "namespaces": {name: metrics.snapshot() for name, metrics in sorted(self.namespaces.items())},
+            "hot_keys": self.hot_keys.top(hot_keys),
+        }
+
+    def reset(self):
+        """Drop all recorded metrics."""
+        self.namespaces.clear()
+        self.hot_keys.counts.clear()
@@ -0,0 +1,85 @@
+"""Circuit breaker for calls to unreliable dependencies."""
+import logging
+import time
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open trial call.
+
+    A trial that never reports an outcome, because it was cancelled or
+    failed in a way that says nothing about the dependency, is replaced by
+    a new one after reset_timeout, so the circuit cannot stay half-open.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        # When the circuit opened, or when the current half-open trial started
+        self.opened_at = 0.0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        """Check whether a call may proceed, moving to half-open when due."""
+        if self.state == self.CLOSED:
+            return True
+
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            # Let exactly one trial call through to probe recovery
+            if self.state == self.OPEN:
+                logger.info(f"Circuit {self.name} half-open, probing recovery")
+            else:
+                logger.warning(f"Circuit {self.name} trial call timed out, probing again")
+            self.state = self.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return True
+
+        self.rejected += 1
+        return False
+
+    def is_open(self) -> bool:
+        """Check whether calls are currently being rejected, without consuming a trial."""
+        return self.state != self.CLOSED and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self):
+        """Record a successful call, closing the circuit."""
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed")
+        self.state = self.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        """Record a failed call, opening the circuit past the threshold."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit {self.name} opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_trial(self):
+        """End a half-open trial without a verdict, so the next call can probe again."""
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic() - self.reset_timeout
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get the breaker state and counters."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "rejected_calls": self.rejected,
+        }
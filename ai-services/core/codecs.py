@@ -0,0 +1,261 @@
+"""Pluggable binary codecs for cached values.
+
+Encoded values start with a four byte header: a two byte magic, the codec
+id and the compression id. The magic is not valid UTF-8, so values written
+before codecs were introduced are still recognized and read as text.
+"""
+import json
+import logging
+import struct
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"\xc5\x7e"
+HEADER = struct.Struct("<2sBB")
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded or decoded."""
+
+
+class Codec:
+    """Serializes values to and from bytes."""
+
+    name = ""
+    codec_id = 0
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: memoryview) -> Any:
+        raise NotImplementedError
+
+
+class TextCodec(Codec):
+    """Plain strings as UTF-8."""
+
+    name = "text"
+    codec_id = 1
+
+    def encode(self, value: Any) -> bytes:
+        return value.encode("utf-8")
+
+    def decode(self, data: memoryview) -> Any:
+        return str(data, "utf-8")
+
+
+class JSONCodec(Codec):
+    """Compact JSON."""
+
+    name = "json"
+    codec_id = 2
+
+    def encode(self, value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+
+    def decode(self, data: memoryview) -> Any:
+        return json.loads(bytes(data))
+
+
+class MsgpackCodec(Codec):
+    """MessagePack, smaller and faster than JSON for nested numeric records."""
+
+    name = "msgpack"
+    codec_id = 3
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, default=str)
+
+    def decode(self, data: memoryview) -> Any:
+        return msgpack.unpackb(data)
+
+
+class NumpyCodec(Codec):
+    """Raw NumPy buffers prefixed with their dtype and shape.
+
+    Decoding returns a read-only array viewing the stored bytes, so no
+    per-element Python objects are created in either direction.
+    """
+
+    name = "numpy"
+    codec_id = 4
+
+    def encode(self, value: Any) -> bytes:
+        # ascontiguousarray would turn 0-d arrays into 1-d ones
+        array = np.asarray(value, order="C")
+        if array.dtype.hasobject:
+            raise CodecError("Object arrays cannot be stored as raw buffers")
+
+        dtype = array.dtype.str.encode("ascii")
+        header = struct.pack(f"<B{len(dtype)}sB{array.ndim}Q", len(dtype), dtype, array.ndim, *array.shape)
+        # A byte view of the flattened array, since memoryview.cast rejects empty shapes
+        return b"".join((header, memoryview(array.reshape(-1).view(np.uint8))))
+
+    def decode(self, data: memoryview) -> Any:
+        dtype_length = data[0]
+        dtype = np.dtype(bytes(data[1:1 + dtype_length]).decode("ascii"))
+        offset = 1 + dtype_length
+        ndim = data[offset]
+        shape = struct.unpack_from(f"<{ndim}Q", data, offset + 1)
+        offset += 1 + 8 * ndim
+        return np.frombuffer(data, dtype=dtype, offset=offset).reshape(shape)
+
+
+CODECS: Dict[str, Codec] = {
+    codec.name: codec
+    for codec in (TextCodec(), JSONCodec(), MsgpackCodec(), NumpyCodec())
+}
+_CODECS_BY_ID = {codec.codec_id: codec for codec in CODECS.values()}
+
+NO_COMPRESSION = 0
+ZSTD = 1
+LZ4 = 2
+COMPRESSIONS = {"none": NO_COMPRESSION, "zstd": ZSTD, "lz4": LZ4}
+
+
+def _compress(payload: bytes, compression: int) -> bytes:
+    if compression == ZSTD:
+        return zstandard.ZstdCompressor().compress(payload)
+    return lz4.frame.compress(payload)
+
+
+def _decompress(payload: memoryview, compression: int) -> memoryview:
+    if compression == ZSTD:
+        if zstandard is None:
+            raise CodecError("Value is zstd compressed but zstandard is not installed")
+        return memoryview(zstandard.ZstdDecompressor().decompress(payload))
+    if compression == LZ4:
+        if lz4 is None:
+            raise CodecError("Value is lz4 compressed but lz4 is not installed")
+        return memoryview(lz4.frame.decompress(payload))
+    raise CodecError(f"Unknown compression id {compression}")
+
+
+class CodecRegistry:
+    """Choose a codec per key namespace and tag stored values with it.
+
+    The namespace is the part of the key before the first colon. Strings
+    are stored as text and arrays as raw buffers whatever the namespace;
+    other values use the namespace's codec, or JSON by default. Payloads
+    above the compression threshold are compressed when it saves space.
+    """
+
+    def __init__(
+        self,
+        namespace_codecs: Dict[str, str],
+        default_codec: str = "json",
+        compression: str = "none",
+        compression_threshold: int = 4096
+    ):
+        for name in [default_codec, *namespace_codecs.values()]:
+            if name not in CODECS:
+                raise ValueError(f"Unknown cache codec {name!r}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression {compression!r}")
+
+        self.namespace_codecs = {ns: self._available(CODECS[name]) for ns, name in namespace_codecs.items()}
+        self.default_codec = self._available(CODECS[default_codec])
+        self.compression = COMPRESSIONS[compression]
+        if self.compression == ZSTD and zstandard is None or self.compression == LZ4 and lz4 is None:
+            logger.warning(f"{compression} is not installed, cached values will not be compressed")
+            self.compression = NO_COMPRESSION
+        self.compression_threshold = compression_threshold
+
+    @staticmethod
+    def _available(codec: Codec) -> Codec:
+        if codec.name == "msgpack" and msgpack is None:
+            logger.warning("msgpack is not installed, falling back to JSON for cached values")
+            return CODECS["json"]
+        return codec
+
+    def codec_for(self, key: str, value: Any) -> Codec:
+        """Pick the codec for a value stored under key."""
+        if isinstance(value, str):
+            return CODECS["text"]
+        if isinstance(value, np.ndarray):
+            return CODECS["numpy"]
+        return self.namespace_codecs.get(key.split(":", 1)[0], self.default_codec)
+
+    def encode(self, key: str, value: Any) -> bytes:
+        """Encode a value with its namespace codec and a tagging header."""
+        codec = self.codec_for(key, value)
+        payload = codec.encode(value)
+
+        compression = NO_COMPRESSION
+        if self.compression != NO_COMPRESSION and len(payload) > self.compression_threshold:
+            compressed = _compress(payload, self.compression)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+
+        return HEADER.pack(MAGIC, codec.codec_id, compression) + payload
+
+    def decode(self, data: Optional[bytes]) -> Any:
+        """Decode a stored value; untagged values are read as UTF-8 text.
+
+        Any failure to decode corrupt or foreign data raises CodecError.
+        """
+        if data is None:
+            return None
+
+        try:
+            return self._decode(data)
+        except CodecError:
+            raise
+        except Exception as e:
+            raise CodecError(f"Undecodable cached value: {e!r}") from e
+
+    def _decode(self, data: bytes) -> Any:
+        if not data.startswith(MAGIC):
+            return _decode_untagged(data)
+
+        _, codec_id, compression = HEADER.unpack_from(data)
+        codec = _CODECS_BY_ID.get(codec_id)
+        if codec is None:
+            raise CodecError(f"Unknown codec id {codec_id}")
+        if codec.name == "msgpack" and msgpack is None:
+            raise CodecError("Value is msgpack encoded but msgpack is not installed")
+
+        payload = memoryview(data)[HEADER.size:]
+        if compression != NO_COMPRESSION:
+            payload = _decompress(payload, compression)
+        return codec.decode(payload)
+
+
+def _decode_untagged(data: bytes) -> Any:
+    """Read a value written before codecs, restoring JSON dicts and lists."""
+    text = data.decode("utf-8")
+    if text and text[0] in "{[":
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+# Global codec registry
+codec_registry = CodecRegistry(
+    settings.cache_codecs,
+    default_codec=settings.cache_default_codec,
+    compression=settings.cache_compression,
+    compression_threshold=settings.cache_compression_threshold
+)
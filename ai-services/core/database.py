@@ -1,8 +1,10 @@
 """Database connection and session management."""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Generator, List, Optional
 import logging
 
 from config.settings import settings
@@ -10,8 +12,20 @@ from config.settings import settings
 logger = logging.getLogger(__name__)
 
 
+def _async_database_url(url: str) -> str:
+    """Swap the sync PostgreSQL driver in a database URL for asyncpg."""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+    return parsed.render_as_string(hide_password=False)
+
+
 class DatabaseManager:
-    """Database connection manager."""
+    """Database connection manager.
+    
+    The async engine serves the API endpoints without blocking the event
+    loop. The sync engine is kept for worker threads and processes.
+    """
     
     def __init__(self):
         self.engine = create_engine(
@@ -27,6 +41,19 @@ class DatabaseManager:
             autoflush=False,
             bind=self.engine
         )
+        self.async_engine = create_async_engine(
+            _async_database_url(settings.database_url),
+            pool_pre_ping=True,
+            pool_recycle=300,
+            pool_size=settings.database_async_pool_size,
+            max_overflow=settings.database_async_max_overflow,
+            echo=settings.debug,
+        )
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
     
     @contextmanager
     def get_session(self) -> Generator[Session, None, None]:
@@ -46,9 +73,38 @@ class DatabaseManager:
         """FastAPI dependency for database sessions."""
         with self.get_session() as session:
             yield session
+    
+    @asynccontextmanager
+    async def get_async_session(self) -> AsyncIterator[AsyncSession]:
+        """Get async database session with proper cleanup."""
+        async with self.AsyncSessionLocal() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Database session error: {e}")
+                raise
+    
+    async def get_async_session_dependency(self) -> AsyncGenerator[AsyncSession, None]:
+        """FastAPI dependency for async database sessions."""
+        async with self.get_async_session() as session:
+            yield session
+    
+    async def fetch_all(self, query, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Run a query in its own session and return its rows as dicts.
+        
+        An AsyncSession runs one statement at a time, so independent
+        queries gathered concurrently each need a session of their own.
+        """
+        async with self.get_async_session() as session:
+            result = await session.execute(query, params or {})
+            return [row._asdict() for row in result.fetchall()]
+    
+    async def close(self):
+        """Close all pooled async connections."""
+        await self.async_engine.dispose()
 
 
 # Global database manager instance
 db_manager = DatabaseManager()
-
-
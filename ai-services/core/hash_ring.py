@@ -0,0 +1,58 @@
+"""Consistent hash ring for routing keys to Redis nodes."""
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.md5(value.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """Consistent hashing with virtual nodes.
+
+    Each node is placed on the ring at many pseudo-random points, which
+    spreads keys evenly. Adding or removing a node only remaps the keys
+    between its points and their predecessors, roughly 1/N of all keys.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), virtual_nodes: int = 160):
+        self.virtual_nodes = virtual_nodes
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str):
+        """Place a node on the ring."""
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for replica in range(self.virtual_nodes):
+            point = _hash(f"{node}#{replica}")
+            if point not in self._owners:
+                self._owners[point] = node
+                bisect.insort(self._points, point)
+
+    def remove_node(self, node: str):
+        """Take a node off the ring."""
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        self._points = [point for point in self._points if self._owners[point] != node]
+        self._owners = {point: owner for point, owner in self._owners.items() if owner != node}
+
+    def get_node(self, key: str) -> Optional[str]:
+        """Get the node owning a key, the first point clockwise from its hash."""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+    def group(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """Group keys by owning node, preserving their order within each group."""
+        groups: Dict[str, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self.get_node(key), []).append(key)
+        return groups
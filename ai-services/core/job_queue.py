@@ -0,0 +1,129 @@
+"""Reliable Redis job queue with acknowledgements, retries and visibility timeouts."""
+import logging
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+from core.codecs import codec_registry
+from core.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+# Requeue claims whose visibility timeout has passed, then move the next
+# job from pending to processing with a fresh deadline. Returns its id.
+CLAIM_JOB_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now_ms, 'LIMIT', 0, 100)
+for _, job_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[2], job_id)
+    redis.call('RPUSH', KEYS[1], job_id)
+end
+
+local job_id = redis.call('RPOP', KEYS[1])
+if job_id then
+    redis.call('ZADD', KEYS[2], now_ms + tonumber(ARGV[1]), job_id)
+end
+return job_id
+"""
+
+
+class JobQueue:
+    """FIFO job queue built on a Redis list and a sorted set of in-flight claims.
+
+    A claimed job stays in the processing set until it is acknowledged. If
+    the worker dies or overruns the visibility timeout, the next claim puts
+    the job back at the front of the queue. Failed attempts are retried
+    with exponential backoff by pushing the claim deadline into the future.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    RETRYING = "retrying"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pending_key = f"jobs:queue:{name}:pending"
+        self.processing_key = f"jobs:queue:{name}:processing"
+        self._claim_script = redis_manager.client.register_script(CLAIM_JOB_SCRIPT)
+
+    @staticmethod
+    def job_key(job_id: str) -> str:
+        return f"jobs:{job_id}"
+
+    async def enqueue(self, job_type: str, payload: Dict[str, Any], max_attempts: Optional[int] = None) -> Dict[str, Any]:
+        """Store a job record and queue it, returning the record."""
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "job_type": job_type,
+            "payload": payload,
+            "status": self.QUEUED,
+            "attempts": 0,
+            "max_attempts": max_attempts or settings.job_max_attempts,
+            "error": None,
+            "result": None,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+        }
+
+        async with redis_manager.pipeline() as pipe:
+            pipe.set(self.job_key(job_id), codec_registry.encode(self.job_key(job_id), job), ex=settings.job_result_ttl)
+            pipe.lpush(self.pending_key, job_id)
+
+        logger.info(f"Queued {job_type} job {job_id} on {self.name}")
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a job record by id.
+
+        Records live on the primary node next to the queue, not on the
+        sharded cache nodes. Redis errors propagate, so a worker never
+        mistakes an outage for an expired record.
+        """
+        raw = await redis_manager.execute(lambda: redis_manager.client.get(self.job_key(job_id)))
+        return codec_registry.decode(raw)
+
+    async def save_job(self, job: Dict[str, Any]):
+        """Persist changes to a job record."""
+        key = self.job_key(job["job_id"])
+        await redis_manager.execute(
+            lambda: redis_manager.client.set(key, codec_registry.encode(key, job), ex=settings.job_result_ttl)
+        )
+
+    async def claim(self) -> Optional[str]:
+        """Claim the next job for this worker, or None when the queue is empty."""
+        visibility_ms = int(settings.job_visibility_timeout * 1000)
+        job_id = await redis_manager.execute(
+            lambda: self._claim_script(keys=[self.pending_key, self.processing_key], args=[visibility_ms])
+        )
+        return job_id.decode("utf-8") if job_id else None
+
+    async def ack(self, job_id: str):
+        """Remove a finished job from the processing set."""
+        await redis_manager.execute(lambda: redis_manager.client.zrem(self.processing_key, job_id))
+
+    async def retry_later(self, job_id: str, delay: float):
+        """Leave a failed job claimed until delay passes, when the next claim requeues it."""
+        deadline_ms = int((time.time() + delay) * 1000)
+        await redis_manager.execute(
+            lambda: redis_manager.client.zadd(self.processing_key, {job_id: deadline_ms}, xx=True)
+        )
+
+    async def get_stats(self) -> Dict[str, int]:
+        """Get the number of queued and in-flight jobs."""
+        async with redis_manager.pipeline(transaction=False) as pipe:
+            pipe.llen(self.pending_key)
+            pipe.zcard(self.processing_key)
+            pending, processing = await pipe.execute()
+        return {"pending": pending, "processing": processing}
+
+
+# Global job queue for heavy ML work
+job_queue = JobQueue(settings.job_queue_name)
@@ -0,0 +1,55 @@
+"""Bounded in-process LRU cache with per-entry expiry."""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Least-recently-used cache whose entries also expire after a TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live entry and mark it as recently used."""
+        entry = self._entries.get(key, _MISSING)
+        if entry is _MISSING:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store an entry, evicting the least recently used one when full."""
+        self._entries[key] = (time.monotonic() + (ttl if ttl is not None else self.ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Remove an entry if present."""
+        self._entries.pop(key, None)
+
+    def pop_prefix(self, prefix: str):
+        """Remove every entry whose key starts with prefix."""
+        for key in [key for key in self._entries if str(key).startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
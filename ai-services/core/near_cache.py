@@ -0,0 +1,206 @@
+"""In-process near cache in front of Redis with pub/sub invalidation."""
+import asyncio
+import json
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config.settings import settings
+from core.lru_cache import TTLCache
+from core.redis_client import RedisManager, redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+class NearCache:
+    """Two-tier cache: a bounded local LRU backed by Redis.
+
+    Writes and deletes go to Redis and are broadcast on a pub/sub channel so
+    other workers drop their local copies. Local entries also expire after
+    a short TTL, bounding staleness if an invalidation is ever missed.
+    """
+
+    def __init__(self, redis: RedisManager, maxsize: int, ttl: float, channel: str):
+        self.redis = redis
+        self.channel = channel
+        self.local = TTLCache(maxsize, ttl)
+        self.instance_id = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._clear_callbacks: List[Callable[[Optional[List[str]]], None]] = []
+        self.stats = {"local_hits": 0, "remote_hits": 0, "misses": 0, "invalidations_received": 0}
+
+    async def get(self, key: str) -> Any:
+        """Get a value from local memory, falling back to Redis."""
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        value = await self.redis.get(key)
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["remote_hits"] += 1
+        self.local.set(key, value)
+        return value
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get many values, reading only locally missing keys from Redis."""
+        results = {key: self.local.get(key) for key in keys}
+        self.stats["local_hits"] += sum(value is not None for value in results.values())
+
+        missing = [key for key, value in results.items() if value is None]
+        for key, value in (await self.redis.get_many(missing)).items():
+            results[key] = value
+            if value is None:
+                self.stats["misses"] += 1
+            else:
+                self.stats["remote_hits"] += 1
+                self.local.set(key, value)
+        return results
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]], ttl: int, **options: Any) -> Any:
+        """Get a value locally or through RedisManager.get_or_compute.
+
+        Recomputed values replace the local copy and invalidate other
+        workers' copies, including values refreshed in the background.
+        """
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        async def on_store(stored: Any):
+            self.local.set(key, stored)
+            await self._publish([key])
+
+        value = await self.redis.get_or_compute(key, compute, ttl, on_store=on_store, **options)
+        self.local.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Write through to Redis and invalidate other workers' copies."""
+        success = await self.redis.set(key, value, ttl=ttl)
+        if success:
+            self.local.set(key, value)
+            await self._publish([key])
+        return success
+
+    async def set_many(self, values: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """Write many values through to Redis and invalidate other workers' copies."""
+        success = await self.redis.set_many(values, ttl=ttl)
+        if success:
+            for key, value in values.items():
+                self.local.set(key, value)
+            await self._publish(list(values))
+        return success
+
+    async def store_computed(self, values: Dict[str, Any], ttl: int, **options: Any) -> bool:
+        """Write values through RedisManager.store_computed and invalidate other workers' copies."""
+        success = await self.redis.store_computed(values, ttl, **options)
+        if success:
+            for key, value in values.items():
+                self.local.set(key, value)
+            await self._publish(list(values))
+        return success
+
+    async def delete(self, key: str) -> bool:
+        """Delete a key everywhere."""
+        self.local.pop(key)
+        deleted = await self.redis.delete(key)
+        await self._publish([key])
+        return deleted
+
+    async def invalidate(self, keys: Optional[List[str]] = None, namespaces: Optional[List[str]] = None):
+        """Drop local copies in every worker; all keys when none are given.
+
+        A full drop also runs the on_clear callbacks in every worker with
+        the namespaces being cleared, None meaning all of them.
+        """
+        if keys is None:
+            self._clear(namespaces)
+        else:
+            for key in keys:
+                self.local.pop(key)
+        await self._publish(keys, namespaces)
+
+    def on_clear(self, callback: Callable[[Optional[List[str]]], None]):
+        """Register a callback for full invalidations, such as a cache clear, in any worker."""
+        self._clear_callbacks.append(callback)
+
+    def _clear(self, namespaces: Optional[List[str]] = None):
+        self.local.clear()
+        for callback in self._clear_callbacks:
+            try:
+                callback(namespaces)
+            except Exception as e:
+                logger.error(f"Near cache clear callback failed: {e}")
+
+    async def _publish(self, keys: Optional[List[str]], namespaces: Optional[List[str]] = None):
+        message = json.dumps({"origin": self.instance_id, "keys": keys, "namespaces": namespaces})
+        await self.redis.publish(self.channel, message)
+
+    def start(self):
+        """Start listening for invalidations from other workers."""
+        if self._listener is None:
+            self._listener = asyncio.ensure_future(self._listen())
+
+    async def stop(self):
+        """Stop listening for invalidations."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_invalidation(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while disconnected
+                logger.error(f"Near cache invalidation listener error: {e}")
+                self._clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def _handle_invalidation(self, data: str):
+        try:
+            message = json.loads(data)
+        except ValueError:
+            logger.warning(f"Ignoring malformed cache invalidation: {data!r}")
+            return
+
+        if message.get("origin") == self.instance_id:
+            return
+
+        self.stats["invalidations_received"] += 1
+        keys = message.get("keys")
+        if keys is None:
+            self._clear(message.get("namespaces"))
+        else:
+            for key in keys:
+                self.local.pop(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get local/remote hit counters and local size."""
+        return {**self.stats, "local_size": len(self.local)}
+
+
+# Global near cache instance
+near_cache = NearCache(
+    redis_manager,
+    settings.near_cache_size,
+    settings.near_cache_ttl,
+    settings.near_cache_channel
+)
@@ -0,0 +1,38 @@
+"""SQL queries shared by the API and background workers."""
+from sqlalchemy import text
+
+DEMAND_HISTORY_QUERY = text("""
+    SELECT 
+        oi.product_id,
+        p.name as product_name,
+        p.category,
+        o.created_at,
+        oi.quantity
+    FROM order_items oi
+    JOIN orders o ON oi.order_id = o.id
+    JOIN products p ON oi.product_id = p.id
+    WHERE o.created_at >= CAST(:start_date AS date)
+    AND o.created_at <= CAST(:end_date AS date)
+    AND oi.product_id = :product_id
+    ORDER BY o.created_at
+""")
+
+INVENTORY_QUERY = text("""
+    SELECT 
+        i.product_id,
+        p.name as product_name,
+        p.category,
+        i.current_stock,
+        i.min_stock_threshold,
+        p.price,
+        p.lead_time_days
+    FROM inventory i
+    JOIN products p ON i.product_id = p.id
+    WHERE i.buyer_id = :buyer_id
+""")
+
+PRODUCT_CATEGORIES_QUERY = text("""
+    SELECT id::text AS id, category
+    FROM products
+    WHERE id::text = ANY(:product_ids)
+""")
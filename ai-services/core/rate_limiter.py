@@ -0,0 +1,159 @@
+"""Redis-backed token bucket rate limiting with a local priority queue."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Dict, Any, List, Tuple
+
+import redis
+
+from core.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+# Refill and take from the request and token buckets atomically.
+# Returns 0 when both buckets had capacity, otherwise the milliseconds
+# to wait until they will.
+TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+local now_ms = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+local wait_ms = 0
+local levels = {}
+
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[(i - 1) * 3 + 1])
+    local rate = tonumber(ARGV[(i - 1) * 3 + 2])
+    local needed = tonumber(ARGV[(i - 1) * 3 + 3])
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now_ms
+    level = math.min(capacity, level + (now_ms - ts) * rate)
+    levels[i] = level
+    if level < needed then
+        wait_ms = math.max(wait_ms, math.ceil((needed - level) / rate))
+    end
+end
+
+if wait_ms == 0 then
+    for i = 1, 2 do
+        local capacity = tonumber(ARGV[(i - 1) * 3 + 1])
+        local rate = tonumber(ARGV[(i - 1) * 3 + 2])
+        local level = levels[i] - tonumber(ARGV[(i - 1) * 3 + 3])
+        redis.call('HSET', KEYS[i], 'level', level, 'ts', now_ms)
+        redis.call('PEXPIRE', KEYS[i], math.ceil((capacity - level) / rate) + 1000)
+    end
+end
+
+return wait_ms
+"""
+
+
+class RateLimiter:
+    """Requests/min and tokens/min limiter shared across workers through Redis.
+
+    Callers wait in a priority queue, so interactive requests are admitted
+    before queued background work as soon as bucket capacity frees up.
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._script = redis_manager.client.register_script(TOKEN_BUCKET_SCRIPT)
+        self._local_buckets: Dict[str, Tuple[float, float]] = {}
+        self._waiters: List[Tuple[int, int, asyncio.Future, int]] = []
+        self._sequence = itertools.count()
+        self._dispatcher = None
+        self.metrics: Dict[int, Dict[str, float]] = {}
+
+    async def acquire(self, tokens: int, priority: int = INTERACTIVE):
+        """Wait until one request and the given number of tokens are available."""
+        tokens = min(tokens, self.tokens_per_minute)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future, tokens))
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+        started = time.perf_counter()
+        await future
+        self._record_wait(priority, time.perf_counter() - started)
+
+    async def _dispatch(self):
+        """Admit queued callers in priority order as bucket capacity allows."""
+        while self._waiters:
+            priority, _, future, tokens = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+
+            wait = await self._try_take(tokens)
+            if wait <= 0:
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+            else:
+                await asyncio.sleep(wait)
+
+    async def _try_take(self, tokens: int) -> float:
+        """Take capacity from the shared buckets, returning seconds to wait if short."""
+        try:
+            wait_ms = await redis_manager.execute(lambda: self._script(
+                keys=[f"ratelimit:{self.name}:requests", f"ratelimit:{self.name}:tokens"],
+                args=[
+                    self.requests_per_minute, self.requests_per_minute / 60000, 1,
+                    self.tokens_per_minute, self.tokens_per_minute / 60000, tokens,
+                ]
+            ))
+            return wait_ms / 1000
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, limiting locally: {e}")
+            return self._try_take_local(tokens)
+
+    def _try_take_local(self, tokens: int) -> float:
+        """Per-process token bucket used when Redis cannot be reached."""
+        now = time.monotonic()
+        limits = {"requests": (self.requests_per_minute, 1), "tokens": (self.tokens_per_minute, tokens)}
+        levels = {}
+        wait = 0.0
+
+        for bucket, (capacity, needed) in limits.items():
+            level, updated = self._local_buckets.get(bucket, (capacity, now))
+            level = min(capacity, level + (now - updated) * capacity / 60)
+            levels[bucket] = level
+            if level < needed:
+                wait = max(wait, (needed - level) * 60 / capacity)
+
+        if wait == 0:
+            for bucket, (capacity, needed) in limits.items():
+                self._local_buckets[bucket] = (levels[bucket] - needed, now)
+        return wait
+
+    def _record_wait(self, priority: int, waited: float):
+        """Accumulate admission wait times per priority."""
+        stats = self.metrics.setdefault(priority, {"admitted": 0, "wait_seconds_total": 0.0, "max_wait_seconds": 0.0})
+        stats["admitted"] += 1
+        stats["wait_seconds_total"] += waited
+        stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get queue depth and wait time metrics."""
+        depth: Dict[int, int] = {}
+        for priority, _, future, _ in self._waiters:
+            if not future.done():
+                depth[priority] = depth.get(priority, 0) + 1
+
+        return {
+            "queue_depth": sum(depth.values()),
+            "queue_depth_by_priority": depth,
+            "priorities": {
+                priority: {
+                    **stats,
+                    "avg_wait_seconds": stats["wait_seconds_total"] / stats["admitted"] if stats["admitted"] else 0.0
+                }
+                for priority, stats in self.metrics.items()
+            }
+        }
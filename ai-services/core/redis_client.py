@@ -1,55 +1,772 @@
 """Redis client configuration and management."""
 import redis
+import redis.asyncio as aioredis
+import asyncio
 import logging
-from typing import Optional, Any, Union
-import json
+import math
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Any, AsyncIterator, Awaitable, Callable, Collection, Dict, List, Set, Union
+import uuid
+from urllib.parse import urlsplit
 
 from config.settings import settings
+from core.cache_metrics import CacheMetrics
+from core.circuit_breaker import CircuitBreaker
+from core.codecs import CodecError, codec_registry
+from core.hash_ring import HashRing
+from core.lru_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Delete the lock only if it is still held by the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisUnavailableError(redis.ConnectionError):
+    """Raised instead of calling Redis while its circuit is open."""
+
+
+def _namespace_pattern(namespace: str) -> str:
+    """SCAN pattern matching every key under a namespace, with glob characters escaped."""
+    return re.sub(r"([*?\[\]\\])", r"\\\1", namespace) + ":*"
+
+
+def _xfetch_key(key: str) -> str:
+    """Key of the XFetch metadata stored next to a computed value."""
+    return f"{key}:xfetch"
+
+
+def _connection_options() -> Dict[str, Any]:
+    """Connection settings shared by the async and sync clients."""
+    return {
+        "db": settings.redis_db,
+        "password": settings.redis_password,
+        # Values are tagged binary payloads decoded by the codec registry
+        "decode_responses": False,
+        # Fail fast, the circuit breaker takes over during outages
+        "socket_connect_timeout": settings.redis_connect_timeout,
+        "socket_timeout": settings.redis_socket_timeout,
+        "retry_on_timeout": False,
+        "health_check_interval": 30,
+        "max_connections": settings.redis_max_connections,
+    }
+
+
+def _node_name(url: str) -> str:
+    """Identify a node by host, port and database, leaving credentials out."""
+    parts = urlsplit(url)
+    return f"{parts.hostname}:{parts.port or 6379}/{parts.path.strip('/') or 0}"
+
+
+class RedisNode:
+    """Connection pool, client and circuit breaker for one Redis server."""
+    
+    def __init__(self, url: str):
+        self.name = _node_name(url)
+        self.pool = aioredis.ConnectionPool.from_url(url, **_connection_options())
+        self.client = aioredis.Redis(connection_pool=self.pool)
+        self.circuit_breaker = CircuitBreaker(
+            f"redis {self.name}",
+            settings.redis_breaker_failure_threshold,
+            settings.redis_breaker_reset_timeout
+        )
+    
+    def get_pool_stats(self) -> Dict[str, int]:
+        """Get connection pool usage."""
+        # redis-py exposes pool occupancy only through private attributes,
+        # which differ between versions, so missing ones count as empty
+        in_use = len(getattr(self.pool, "_in_use_connections", ()))
+        idle = len(getattr(self.pool, "_available_connections", ()))
+        return {
+            "max_connections": self.pool.max_connections,
+            "created_connections": in_use + idle,
+            "in_use_connections": in_use,
+            "idle_connections": idle,
+        }
+
 
 class RedisManager:
-    """Redis connection manager with caching utilities."""
+    """Asyncio Redis connection manager with caching utilities.
+    
+    Cache values are sharded across the nodes in redis_cache_urls (or just
+    redis_url) by consistent hashing, and bulk operations are split into
+    one round-trip per node. Locks follow their key. Sorted sets, pub/sub,
+    streams, queue and rate limiter scripts and pipelines run on the
+    primary node at redis_url.
+    
+    Commands go through a circuit breaker per node. After consecutive
+    failures a node is marked down and calls to it fail immediately, with
+    reads served from a bounded in-process copy of recently used values,
+    until a background probe finds the node reachable again.
+    """
     
     def __init__(self):
-        self.client = redis.from_url(
-            settings.redis_url,
-            db=settings.redis_db,
-            password=settings.redis_password,
-            decode_responses=True,
-            socket_connect_timeout=5,
-            socket_timeout=5,
-            retry_on_timeout=True,
-            health_check_interval=30,
-        )
+        self.primary = RedisNode(settings.redis_url)
+        self.nodes: Dict[str, RedisNode] = {self.primary.name: self.primary}
+        self.ring = HashRing(virtual_nodes=settings.redis_virtual_nodes)
+        for url in settings.redis_cache_urls or [settings.redis_url]:
+            self.add_node(url)
+        
+        self.pool = self.primary.pool
+        self.client = self.primary.client
+        self.circuit_breaker = self.primary.circuit_breaker
+        self._release_lock_script = self.client.register_script(RELEASE_LOCK_SCRIPT)
+        self._refreshes: Set[asyncio.Task] = set()
+        self.refresh_stats = {"computed": 0, "early_refreshes": 0, "stale_served": 0, "lease_waits": 0}
+        self.fallback_cache = TTLCache(settings.redis_fallback_cache_size, settings.redis_fallback_cache_ttl)
+        self._health_probe: Optional[asyncio.Task] = None
+        self.metrics = CacheMetrics(settings.cache_metrics_hot_keys, settings.cache_metrics_key_sample_rate)
+    
+    def add_node(self, url: str) -> RedisNode:
+        """Add a cache node; only the keys it takes over on the ring move to it."""
+        name = _node_name(url)
+        node = self.nodes.get(name)
+        if node is None:
+            node = self.nodes[name] = RedisNode(url)
+        self.ring.add_node(name)
+        logger.info(f"Redis cache node {name} added, {len(self.ring.nodes)} nodes in ring")
+        return node
+    
+    async def remove_node(self, url: str):
+        """Remove a cache node; its keys are remapped to the remaining nodes."""
+        name = _node_name(url)
+        self.ring.remove_node(name)
+        node = self.nodes.get(name)
+        if node is not None and node is not self.primary:
+            del self.nodes[name]
+            await node.client.aclose()
+        logger.info(f"Redis cache node {name} removed, {len(self.ring.nodes)} nodes in ring")
+    
+    def _node_for(self, key: str) -> RedisNode:
+        """Get the cache node owning a key."""
+        return self.nodes[self.ring.get_node(key)]
+    
+    def _group_by_node(self, keys: List[str]) -> List[tuple]:
+        """Split keys into (node, keys) groups for per-node bulk commands."""
+        return [(self.nodes[name], node_keys) for name, node_keys in self.ring.group(keys).items()]
+    
+    async def execute(self, command: Callable[[], Awaitable[Any]], node: Optional[RedisNode] = None) -> Any:
+        """Run a Redis command through the circuit breaker of its node, the primary by default."""
+        breaker = (node or self.primary).circuit_breaker
+        if not breaker.allow_request():
+            raise RedisUnavailableError(f"Redis circuit open for {(node or self.primary).name}")
+        try:
+            result = await command()
+        except BaseException as e:
+            self._record_error(breaker, e)
+            raise
+        breaker.record_success()
+        return result
+    
+    @staticmethod
+    def _record_error(breaker: CircuitBreaker, error: BaseException):
+        """Count unreachable nodes towards opening their circuit.
+        
+        Error replies such as WRONGTYPE or BUSYGROUP mean the node answered,
+        so they count as proof that it is up. Cancellations and errors
+        raised before anything was sent give no verdict on the node.
+        """
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            breaker.record_failure()
+        elif isinstance(error, redis.ResponseError):
+            breaker.record_success()
+        else:
+            breaker.release_trial()
+    
+    async def _execute_measured(
+        self,
+        keys: List[str],
+        command: Callable[[], Awaitable[Any]],
+        node: Optional[RedisNode] = None
+    ) -> Any:
+        """Run a command through the circuit breaker, recording latency and errors for its keys."""
+        started = time.perf_counter()
+        try:
+            result = await self.execute(command, node)
+        except redis.RedisError:
+            self.metrics.record_error(keys)
+            raise
+        self.metrics.record_latency(keys, time.perf_counter() - started)
+        return result
+    
+    async def get(self, key: str, track: bool = True) -> Any:
+        """Get value from Redis; untracked reads don't count as cache hits or misses."""
+        node = self._node_for(key)
+        try:
+            raw = await self._execute_measured([key], lambda: node.client.get(key), node)
+            if track:
+                self.metrics.record_read(key, raw)
+            value = codec_registry.decode(raw)
+        except redis.RedisError as e:
+            logger.error(f"Redis GET error for key {key}: {e}")
+            return self.fallback_cache.get(key)
+        except CodecError as e:
+            logger.error(f"Undecodable value for key {key}: {e}")
+            return None
+        
+        if value is not None:
+            self.fallback_cache.set(key, value)
+        return value
+    
+    async def get_many(self, keys: List[str], untracked: Collection[str] = ()) -> Dict[str, Any]:
+        """Get many values in one round-trip per node, with None for missing keys.
+        
+        Reads of untracked keys, such as XFetch metadata, don't count as
+        cache hits or misses.
+        """
+        if not keys:
+            return {}
+        results = {}
+        for node_results in await asyncio.gather(*[
+            self._get_many_from(node, node_keys, untracked) for node, node_keys in self._group_by_node(keys)
+        ]):
+            results.update(node_results)
+        return {key: results[key] for key in keys}
+    
+    async def _get_many_from(self, node: RedisNode, keys: List[str], untracked: Collection[str]) -> Dict[str, Any]:
+        try:
+            values = await self._execute_measured(keys, lambda: node.client.mget(keys), node)
+            results = {}
+            for key, raw in zip(keys, values):
+                if key not in untracked:
+                    self.metrics.record_read(key, raw)
+                results[key] = codec_registry.decode(raw)
+        except (redis.RedisError, CodecError) as e:
+            logger.error(f"Redis MGET error for {len(keys)} keys on {node.name}: {e}")
+            return {key: self.fallback_cache.get(key) for key in keys}
+        
+        for key, value in results.items():
+            if value is not None:
+                self.fallback_cache.set(key, value)
+        return results
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """Set value in Redis with optional TTL."""
+        try:
+            encoded = codec_registry.encode(key, value)
+        except CodecError as e:
+            logger.error(f"Unencodable value for key {key}: {e}")
+            return False
+        
+        self.fallback_cache.set(key, value, ttl=min(ttl, self.fallback_cache.ttl) if ttl else None)
+        self.metrics.record_write(key, encoded)
+        try:
+            node = self._node_for(key)
+            if ttl:
+                return await self._execute_measured([key], lambda: node.client.setex(key, ttl, encoded), node)
+            else:
+                return await self._execute_measured([key], lambda: node.client.set(key, encoded), node)
+        except redis.RedisError as e:
+            logger.error(f"Redis SET error for key {key}: {e}")
+            return False
+    
+    async def set_many(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """Set many values in one round-trip per node, with a default TTL and per-key overrides.
+        
+        Values that cannot be encoded are skipped and make the result False.
+        """
+        if not values:
+            return True
+        ttls = ttls or {}
+        encoded = {}
+        for key, value in values.items():
+            try:
+                encoded[key] = codec_registry.encode(key, value)
+            except CodecError as e:
+                logger.error(f"Unencodable value for key {key}: {e}")
+                continue
+            key_ttl = ttls.get(key, ttl)
+            self.fallback_cache.set(key, value, ttl=min(key_ttl, self.fallback_cache.ttl) if key_ttl else None)
+            self.metrics.record_write(key, encoded[key])
+        
+        stored = await asyncio.gather(*[
+            self._set_many_on(node, {key: encoded[key] for key in node_keys}, ttl, ttls)
+            for node, node_keys in self._group_by_node(list(encoded))
+        ])
+        return all(stored) and len(encoded) == len(values)
+    
+    async def _set_many_on(
+        self,
+        node: RedisNode,
+        encoded: Dict[str, bytes],
+        ttl: Optional[int],
+        ttls: Dict[str, int]
+    ) -> bool:
+        keys = list(encoded)
+        started = time.perf_counter()
+        try:
+            async with self.pipeline(transaction=False, node=node) as pipe:
+                for key, raw in encoded.items():
+                    pipe.set(key, raw, ex=ttls.get(key, ttl) or None)
+            self.metrics.record_latency(keys, time.perf_counter() - started)
+            return True
+        except redis.RedisError as e:
+            self.metrics.record_error(keys)
+            logger.error(f"Redis pipelined SET error for {len(keys)} keys on {node.name}: {e}")
+            return False
+    
+    @asynccontextmanager
+    async def pipeline(
+        self,
+        transaction: bool = True,
+        node: Optional[RedisNode] = None
+    ) -> AsyncIterator[aioredis.client.Pipeline]:
+        """Queue commands on a pipeline and send them in one round-trip on exit.
+        
+        With transaction set the queued commands run atomically in
+        MULTI/EXEC. Commands executed inside the block with an explicit
+        execute() return their results there; anything still queued is sent
+        when the block exits. Pipelines run on the primary node unless
+        another node is given.
+        """
+        node = node or self.primary
+        if not node.circuit_breaker.allow_request():
+            raise RedisUnavailableError(f"Redis circuit open for {node.name}")
+        try:
+            async with node.client.pipeline(transaction=transaction) as pipe:
+                yield pipe
+                await pipe.execute()
+        except BaseException as e:
+            self._record_error(node.circuit_breaker, e)
+            raise
+        node.circuit_breaker.record_success()
+    
+    async def delete(self, key: str) -> bool:
+        """Delete key from Redis."""
+        self.fallback_cache.pop(key)
+        node = self._node_for(key)
+        try:
+            return bool(await self.execute(lambda: node.client.delete(key), node))
+        except redis.RedisError as e:
+            logger.error(f"Redis DELETE error for key {key}: {e}")
+            return False
+    
+    async def exists(self, key: str) -> bool:
+        """Check if key exists in Redis."""
+        node = self._node_for(key)
+        try:
+            return bool(await self.execute(lambda: node.client.exists(key), node))
+        except redis.RedisError as e:
+            logger.error(f"Redis EXISTS error for key {key}: {e}")
+            return False
+    
+    async def ttl(self, key: str) -> int:
+        """Get remaining time to live of a key in seconds (negative if none)."""
+        node = self._node_for(key)
+        try:
+            return await self.execute(lambda: node.client.ttl(key), node)
+        except redis.RedisError as e:
+            logger.error(f"Redis TTL error for key {key}: {e}")
+            return -2
+    
+    async def ttl_many(self, keys: List[str]) -> Dict[str, int]:
+        """Get remaining time to live of many keys in one round-trip per node."""
+        results = {}
+        for node_results in await asyncio.gather(*[
+            self._ttl_many_on(node, node_keys) for node, node_keys in self._group_by_node(keys)
+        ]):
+            results.update(node_results)
+        return results
     
-    def get(self, key: str) -> Optional[str]:
+    async def _ttl_many_on(self, node: RedisNode, keys: List[str]) -> Dict[str, int]:
+        try:
+            async with self.pipeline(transaction=False, node=node) as pipe:
+                for key in keys:
+                    pipe.ttl(key)
+                return dict(zip(keys, await pipe.execute()))
+        except redis.RedisError as e:
+            logger.error(f"Redis pipelined TTL error for {len(keys)} keys on {node.name}: {e}")
+            return {key: -2 for key in keys}
+    
+    async def zincrby(self, key: str, member: str, amount: float = 1) -> bool:
+        """Increment the score of a sorted set member."""
+        try:
+            await self.execute(lambda: self.client.zincrby(key, amount, member))
+            return True
+        except redis.RedisError as e:
+            logger.error(f"Redis ZINCRBY error for key {key}: {e}")
+            return False
+    
+    async def zrevrange(self, key: str, count: int) -> List[str]:
+        """Get the highest scoring members of a sorted set."""
+        try:
+            members = await self.execute(lambda: self.client.zrevrange(key, 0, count - 1))
+            return [member.decode("utf-8") for member in members]
+        except redis.RedisError as e:
+            logger.error(f"Redis ZREVRANGE error for key {key}: {e}")
+            return []
+    
+    async def zdecay(self, key: str, factor: float, min_score: float) -> bool:
+        """Multiply all scores of a sorted set by factor and drop members below min_score."""
+        try:
+            async with self.pipeline() as pipe:
+                pipe.zunionstore(key, {key: factor})
+                pipe.zremrangebyscore(key, "-inf", f"({min_score}")
+            return True
+        except redis.RedisError as e:
+            logger.error(f"Redis score decay error for key {key}: {e}")
+            return False
+    
+    async def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        """Try to acquire a short-lived lock, returning its token on success."""
+        token = uuid.uuid4().hex
+        node = self._node_for(name)
+        try:
+            if await self.execute(lambda: node.client.set(name, token, nx=True, px=int(ttl * 1000)), node):
+                return token
+            return None
+        except redis.RedisError as e:
+            logger.error(f"Redis lock error for key {name}: {e}")
+            return None
+    
+    async def release_lock(self, name: str, token: str) -> bool:
+        """Release a lock previously acquired with acquire_lock."""
+        node = self._node_for(name)
+        try:
+            return bool(await self.execute(
+                lambda: self._release_lock_script(keys=[name], args=[token], client=node.client),
+                node
+            ))
+        except redis.RedisError as e:
+            logger.error(f"Redis unlock error for key {name}: {e}")
+            return False
+    
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int = 0,
+        beta: float = 1.0,
+        lease_ttl: float = 30.0,
+        lease_wait: float = 35.0,
+        poll_interval: float = 0.1,
+        on_store: Optional[Callable[[Any], Awaitable[None]]] = None
+    ) -> Any:
+        """Get a cached value, recomputing it under a lease when due.
+        
+        Values are kept stale_ttl seconds past their ttl together with how
+        long they took to compute. Readers refresh them early with a
+        probability that rises as expiry nears and with compute time
+        (XFetch), so hot keys are normally refreshed before they expire.
+        Only the caller holding the short lease recomputes; while a
+        refresh is due or running, everyone else keeps getting the stale
+        value. Callers only wait when there is no value at all.
+        """
+        meta_key = _xfetch_key(key)
+        cached = await self.get_many([key, meta_key], untracked=[meta_key])
+        value, meta = cached[key], cached[meta_key]
+        
+        if value is not None:
+            if not isinstance(meta, dict):
+                # Written by a plain set, fresh until Redis expires it
+                return value
+            # XFetch: recompute once now - delta * beta * ln(rand) passes expiry
+            if time.time() - meta["delta"] * beta * math.log(1.0 - random.random()) < meta["expiry"]:
+                return value
+        
+        lease_name = f"{key}:lease"
+        token = await self.acquire_lock(lease_name, lease_ttl)
+        
+        if value is not None:
+            if token is None:
+                self.refresh_stats["stale_served"] += 1
+                return value
+            self.refresh_stats["early_refreshes" if time.time() < meta["expiry"] else "stale_served"] += 1
+            task = asyncio.ensure_future(
+                self._refresh(key, compute, ttl, stale_ttl, lease_name, token, on_store)
+            )
+            self._refreshes.add(task)
+            task.add_done_callback(self._refreshes.discard)
+            return value
+        
+        if token is None:
+            # Another caller is computing the value, wait for its result
+            self.refresh_stats["lease_waits"] += 1
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + lease_wait
+            while loop.time() < deadline:
+                await asyncio.sleep(poll_interval)
+                # The first read already counted the miss, polls are not lookups
+                value = await self.get(key, track=False)
+                if value is not None:
+                    return value
+                if not await self.exists(lease_name):
+                    break
+            token = await self.acquire_lock(lease_name, lease_ttl)
+        
+        return await self._compute_and_store(key, compute, ttl, stale_ttl, lease_name, token, on_store)
+    
+    async def _compute_and_store(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int,
+        stale_ttl: int,
+        lease_name: str,
+        token: Optional[str],
+        on_store: Optional[Callable[[Any], Awaitable[None]]]
+    ) -> Any:
+        """Compute a value, store it with its XFetch metadata and release the lease."""
+        try:
+            started = time.perf_counter()
+            value = await compute()
+            delta = time.perf_counter() - started
+            self.refresh_stats["computed"] += 1
+            
+            await self.store_computed({key: value}, ttl, stale_ttl, delta)
+            if on_store is not None:
+                await on_store(value)
+            return value
+        finally:
+            if token:
+                await self.release_lock(lease_name, token)
+    
+    async def store_computed(
+        self,
+        values: Dict[str, Any],
+        ttl: int,
+        stale_ttl: int = 0,
+        delta: float = 0.0
+    ) -> bool:
+        """Store values computed outside get_or_compute together with their XFetch metadata.
+        
+        delta is how long the values took to compute. Without the metadata,
+        get_or_compute would run XFetch against a previous value's expiry.
+        """
+        expiry = time.time() + ttl
+        entries = dict(values)
+        for key in values:
+            entries[_xfetch_key(key)] = {"delta": delta, "expiry": expiry}
+        return await self.set_many(entries, ttl=ttl + stale_ttl)
+    
+    async def fresh_ttl_many(self, keys: List[str]) -> Dict[str, float]:
+        """Get the seconds until values stored by store_computed go stale.
+        
+        Unlike ttl_many this excludes the stale window. Values written by a
+        plain set fall back to their Redis TTL, with -2 for missing keys and
+        -1 for keys without expiry.
+        """
+        meta_keys = [_xfetch_key(key) for key in keys]
+        metas = await self.get_many(meta_keys, untracked=meta_keys)
+        plain = [key for key in keys if not isinstance(metas[_xfetch_key(key)], dict)]
+        ttls = await self.ttl_many(plain) if plain else {}
+        now = time.time()
+        return {
+            key: ttls[key] if key in ttls else metas[_xfetch_key(key)]["expiry"] - now
+            for key in keys
+        }
+    
+    async def _refresh(self, key: str, *args: Any):
+        """Recompute a value in the background, keeping the stale one on failure."""
+        try:
+            await self._compute_and_store(key, *args)
+        except Exception as e:
+            logger.error(f"Background refresh of {key} failed, keeping stale value: {e}")
+    
+    def get_refresh_stats(self) -> Dict[str, int]:
+        """Get early refresh and stale-while-revalidate counters."""
+        return {**self.refresh_stats, "refreshing": len(self._refreshes)}
+    
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message, returning the number of subscribers that received it."""
+        try:
+            return await self.execute(lambda: self.client.publish(channel, message))
+        except redis.RedisError as e:
+            logger.error(f"Redis PUBLISH error for channel {channel}: {e}")
+            return 0
+    
+    def pubsub(self) -> aioredis.client.PubSub:
+        """Create a pub/sub connection."""
+        return self.client.pubsub(ignore_subscribe_messages=True)
+    
+    async def delete_namespace(self, namespace: str, batch_size: int = 500) -> Optional[int]:
+        """Delete every key under a namespace on every node without blocking Redis.
+        
+        Keys are found with incremental SCAN and removed with UNLINK, which
+        frees memory in a background thread, in batches of batch_size.
+        Returns the number of keys removed, or None on error.
+        """
+        self.fallback_cache.pop_prefix(f"{namespace}:")
+        deleted = 0
+        try:
+            for node in self.nodes.values():
+                cursor = 0
+                while True:
+                    cursor, keys = await self.execute(
+                        lambda: node.client.scan(cursor, match=_namespace_pattern(namespace), count=batch_size),
+                        node
+                    )
+                    if keys:
+                        deleted += await self.execute(lambda: node.client.unlink(*keys), node)
+                    if cursor == 0:
+                        break
+            return deleted
+        except redis.RedisError as e:
+            logger.error(f"Redis namespace delete error for {namespace} after {deleted} keys: {e}")
+            return None
+    
+    async def health_check(self) -> bool:
+        """Check connection health of every node."""
+        healthy = True
+        for node in list(self.nodes.values()):
+            try:
+                await self.execute(node.client.ping, node)
+            except redis.RedisError as e:
+                logger.error(f"Redis health check failed for {node.name}: {e}")
+                healthy = False
+        return healthy
+    
+    def is_available(self) -> bool:
+        """Check cached health of every node without a round-trip."""
+        return not any(node.circuit_breaker.is_open() for node in self.nodes.values())
+    
+    def start_health_probe(self):
+        """Start pinging Redis in the background to track health and detect recovery."""
+        if self._health_probe is None:
+            self._health_probe = asyncio.ensure_future(self._probe_health())
+    
+    async def stop_health_probe(self):
+        """Stop the background health probe."""
+        if self._health_probe is not None:
+            self._health_probe.cancel()
+            try:
+                await self._health_probe
+            except asyncio.CancelledError:
+                pass
+            self._health_probe = None
+    
+    async def _probe_health(self):
+        while True:
+            await asyncio.sleep(settings.redis_health_probe_interval)
+            # While open, pings are rejected until the breaker lets a trial through.
+            # A trial that never reported back stops counting as open after
+            # the reset timeout, so the probe replaces it.
+            for node in list(self.nodes.values()):
+                if not node.circuit_breaker.is_open():
+                    try:
+                        await self.execute(node.client.ping, node)
+                    except redis.RedisError as e:
+                        logger.warning(f"Redis health probe failed for {node.name}: {e}")
+    
+    def get_cache_metrics(self, hot_keys: int = 20) -> Dict[str, Any]:
+        """Get per-namespace cache metrics and the hottest sampled keys."""
+        return self.metrics.get_metrics(hot_keys)
+    
+    def get_circuit_status(self) -> Dict[str, Any]:
+        """Get breaker state per node and fallback cache size."""
+        return {
+            "nodes": {name: node.circuit_breaker.get_status() for name, node in self.nodes.items()},
+            "fallback_cache_size": len(self.fallback_cache)
+        }
+    
+    def get_pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get connection pool usage per node."""
+        return {name: node.get_pool_stats() for name, node in self.nodes.items()}
+    
+    async def close(self):
+        """Close all pooled connections."""
+        for node in self.nodes.values():
+            await node.client.aclose()
+
+
+class SyncRedisManager:
+    """Blocking Redis manager for background jobs and scripts outside the event loop.
+    
+    Keys are routed over the same hash ring as RedisManager, so both see
+    the same cache entries.
+    """
+    
+    def __init__(self):
+        self.client = redis.from_url(settings.redis_url, **_connection_options())
+        self.clients = {_node_name(settings.redis_url): self.client}
+        self.ring = HashRing(virtual_nodes=settings.redis_virtual_nodes)
+        for url in settings.redis_cache_urls or [settings.redis_url]:
+            name = _node_name(url)
+            if name not in self.clients:
+                self.clients[name] = redis.from_url(url, **_connection_options())
+            self.ring.add_node(name)
+        self._release_lock_script = self.client.register_script(RELEASE_LOCK_SCRIPT)
+    
+    def _client_for(self, key: str) -> redis.Redis:
+        return self.clients[self.ring.get_node(key)]
+    
+    def get(self, key: str) -> Any:
         """Get value from Redis."""
         try:
-            return self.client.get(key)
+            return codec_registry.decode(self._client_for(key).get(key))
         except redis.RedisError as e:
             logger.error(f"Redis GET error for key {key}: {e}")
             return None
+        except CodecError as e:
+            logger.error(f"Undecodable value for key {key}: {e}")
+            return None
+    
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Get many values in one round-trip per node, with None for missing keys."""
+        results = {}
+        for name, node_keys in self.ring.group(keys).items():
+            try:
+                values = self.clients[name].mget(node_keys)
+                results.update((key, codec_registry.decode(value)) for key, value in zip(node_keys, values))
+            except (redis.RedisError, CodecError) as e:
+                logger.error(f"Redis MGET error for {len(node_keys)} keys on {name}: {e}")
+                results.update((key, None) for key in node_keys)
+        return {key: results[key] for key in keys}
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set value in Redis with optional TTL."""
         try:
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+            value = codec_registry.encode(key, value)
             
             if ttl:
-                return self.client.setex(key, ttl, value)
+                return self._client_for(key).setex(key, ttl, value)
             else:
-                return self.client.set(key, value)
+                return self._client_for(key).set(key, value)
         except redis.RedisError as e:
             logger.error(f"Redis SET error for key {key}: {e}")
             return False
+        except CodecError as e:
+            logger.error(f"Unencodable value for key {key}: {e}")
+            return False
+    
+    def set_many(
+        self,
+        values: Dict[str, Any],
+        ttl: Optional[int] = None,
+        ttls: Optional[Dict[str, int]] = None
+    ) -> bool:
+        """Set many values in one round-trip per node, with a default TTL and per-key overrides."""
+        ttls = ttls or {}
+        stored = True
+        for name, node_keys in self.ring.group(values).items():
+            try:
+                pipe = self.clients[name].pipeline(transaction=False)
+                for key in node_keys:
+                    pipe.set(key, codec_registry.encode(key, values[key]), ex=ttls.get(key, ttl) or None)
+                pipe.execute()
+            except (redis.RedisError, CodecError) as e:
+                logger.error(f"Redis pipelined SET error for {len(node_keys)} keys on {name}: {e}")
+                stored = False
+        return stored
     
     def delete(self, key: str) -> bool:
         """Delete key from Redis."""
         try:
-            return bool(self.client.delete(key))
+            return bool(self._client_for(key).delete(key))
         except redis.RedisError as e:
             logger.error(f"Redis DELETE error for key {key}: {e}")
             return False
@@ -57,31 +774,42 @@ class RedisManager:
     def exists(self, key: str) -> bool:
         """Check if key exists in Redis."""
         try:
-            return bool(self.client.exists(key))
+            return bool(self._client_for(key).exists(key))
         except redis.RedisError as e:
             logger.error(f"Redis EXISTS error for key {key}: {e}")
             return False
     
-    def flush_db(self) -> bool:
-        """Flush current database."""
+    def acquire_lock(self, name: str, ttl: float) -> Optional[str]:
+        """Try to acquire a short-lived lock, returning its token on success."""
+        token = uuid.uuid4().hex
         try:
-            self.client.flushdb()
-            return True
+            if self._client_for(name).set(name, token, nx=True, px=int(ttl * 1000)):
+                return token
+            return None
         except redis.RedisError as e:
-            logger.error(f"Redis FLUSHDB error: {e}")
-            return False
+            logger.error(f"Redis lock error for key {name}: {e}")
+            return None
     
-    def health_check(self) -> bool:
-        """Check Redis connection health."""
+    def release_lock(self, name: str, token: str) -> bool:
+        """Release a lock previously acquired with acquire_lock."""
         try:
-            self.client.ping()
-            return True
+            return bool(self._release_lock_script(keys=[name], args=[token], client=self._client_for(name)))
         except redis.RedisError as e:
-            logger.error(f"Redis health check failed: {e}")
+            logger.error(f"Redis unlock error for key {name}: {e}")
             return False
+    
+    def health_check(self) -> bool:
+        """Check connection health of every node."""
+        healthy = True
+        for name, client in self.clients.items():
+            try:
+                client.ping()
+            except redis.RedisError as e:
+                logger.error(f"Redis health check failed for {name}: {e}")
+                healthy = False
+        return healthy
 
 
-# Global Redis manager instance
+# Global Redis manager instances
 redis_manager = RedisManager()
-
-
+sync_redis_manager = SyncRedisManager()
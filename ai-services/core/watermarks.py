@@ -0,0 +1,94 @@
+"""Per-entity data watermarks for O(1) cache invalidation."""
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+import redis
+
+from core.redis_client import redis_manager
+
+logger = logging.getLogger(__name__)
+
+
+class DataWatermarks:
+    """Monotonic data versions per product or buyer, kept in Redis hashes.
+
+    Cache keys embed the version of the data they were computed from. When
+    new orders or inventory changes arrive the version is bumped, so older
+    entries are simply never read again and expire on their own, without
+    scanning or deleting anything.
+    """
+
+    PRODUCTS = "products"
+    BUYERS = "buyers"
+    CATEGORIES = "categories"
+
+    @staticmethod
+    def _key(kind: str) -> str:
+        return f"watermarks:{kind}"
+
+    async def get(self, kind: str, entity_id: str) -> int:
+        """Get the current data version of an entity, 0 if it never changed."""
+        try:
+            version = await redis_manager.execute(lambda: redis_manager.client.hget(self._key(kind), entity_id))
+            return int(version or 0)
+        except redis.RedisError as e:
+            logger.error(f"Redis watermark read error for {kind} {entity_id}: {e}")
+            return 0
+
+    async def get_many(self, kind: str, entity_ids: List[str]) -> Dict[str, int]:
+        """Get the current data versions of many entities in one round-trip."""
+        if not entity_ids:
+            return {}
+        try:
+            versions = await redis_manager.execute(lambda: redis_manager.client.hmget(self._key(kind), entity_ids))
+            return {entity_id: int(version or 0) for entity_id, version in zip(entity_ids, versions)}
+        except redis.RedisError as e:
+            logger.error(f"Redis watermark read error for {len(entity_ids)} {kind}: {e}")
+            return {entity_id: 0 for entity_id in entity_ids}
+
+    async def get_versions(self, entities: List[Tuple[str, str]]) -> List[int]:
+        """Get the data versions of (kind, entity_id) pairs of any kinds in one round-trip."""
+        if not entities:
+            return []
+        try:
+            async with redis_manager.pipeline(transaction=False) as pipe:
+                for kind, entity_id in entities:
+                    pipe.hget(self._key(kind), entity_id)
+                versions = await pipe.execute()
+            return [int(version or 0) for version in versions]
+        except redis.RedisError as e:
+            logger.error(f"Redis watermark read error for {len(entities)} entities: {e}")
+            return [0] * len(entities)
+
+    async def bump(self, kind: str, entity_ids: Iterable[str]) -> bool:
+        """Advance the data version of every given entity in one round-trip."""
+        entity_ids = set(entity_ids)
+        if not entity_ids:
+            return True
+        try:
+            async with redis_manager.pipeline(transaction=False) as pipe:
+                for entity_id in entity_ids:
+                    pipe.hincrby(self._key(kind), entity_id, 1)
+            return True
+        except redis.RedisError as e:
+            logger.error(f"Redis watermark update error for {len(entity_ids)} {kind}: {e}")
+            return False
+
+    @staticmethod
+    def cache_key(namespace: str, entity_id: str, version: int, *parts: Any) -> str:
+        """Build a cache key under namespace:entity_id tied to a data version."""
+        return ":".join([namespace, str(entity_id), f"v{version}", *map(str, parts)])
+
+    async def get_stats(self) -> Dict[str, int]:
+        """Get the number of tracked entities per kind."""
+        stats = {}
+        for kind in (self.PRODUCTS, self.BUYERS, self.CATEGORIES):
+            try:
+                stats[kind] = await redis_manager.execute(lambda: redis_manager.client.hlen(self._key(kind)))
+            except redis.RedisError:
+                stats[kind] = None
+        return stats
+
+
+# Global data watermarks instance
+data_watermarks = DataWatermarks()
@@ -1,16 +1,30 @@
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import ValidationError
 from datetime import datetime
+from typing import Optional, Tuple
+import asyncio
+import hashlib
+import json
 import logging
 
 from config.settings import settings
 from core.database import db_manager
+from core.queries import DEMAND_HISTORY_QUERY, INVENTORY_QUERY
 from core.redis_client import redis_manager
+from core.job_queue import JobQueue, job_queue
+from core.near_cache import near_cache
+from core.watermarks import DataWatermarks, data_watermarks
 from core.logging_config import setup_logging, get_logger
 from services.ai_service import ai_service
-from services.ml_service import ml_service
+from services.ml_service import ml_service, forecast_cache_key
+from services.competitor_index import competitor_index
+from services.product_categories import product_categories
+from services.hot_insights import hot_insights_refresher
+from services.event_consumer import event_consumer
 
 from models import (
     DemandForecastRequest, 
@@ -18,7 +32,13 @@ from models import (
     InventoryOptimizationRequest,
     InventoryOptimizationResponse,
     PriceRecommendationRequest,
-    PriceRecommendationResponse
+    PriceRecommendationResponse,
+    PriceSimulationRequest,
+    PriceSimulationResponse,
+    InsightsJobResponse,
+    BusinessInsightsRequest,
+    JobRequest,
+    JobStatusResponse
 )
 
 setup_logging()
@@ -39,12 +59,48 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def get_db():
-    return db_manager.get_session_dependency()
+@app.on_event("startup")
+async def startup_event():
+    if settings.event_consumer_enabled:
+        event_consumer.start()
+    redis_manager.start_health_probe()
+    near_cache.start()
+    if settings.hot_insights_enabled:
+        hot_insights_refresher.start(load_hot_product_forecast)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await hot_insights_refresher.stop()
+    await event_consumer.stop()
+    await near_cache.stop()
+    await redis_manager.stop_health_probe()
+    await ai_service.close()
+    await redis_manager.close()
+    await db_manager.close()
+
+# Key prefixes cleared by /ai/cache/clear when no namespace is given
+AI_CACHE_NAMESPACES = ["ai_insights", "ai_insights_job", "forecast", "price", "inventory"]
 
 def get_redis():
     return redis_manager
 
+def load_hot_product_forecast(product_id: str, params: dict):
+    """Rebuild a hot product's forecast inputs for insight precomputation"""
+    with db_manager.get_session() as db:
+        data = db.execute(DEMAND_HISTORY_QUERY, {
+            "start_date": params["start_date"],
+            "end_date": params["end_date"],
+            "product_id": product_id
+        }).fetchall()
+    
+    if not data:
+        return None
+    
+    import pandas as pd
+    df = pd.DataFrame([row._asdict() for row in data])
+    predictions, _, _ = asyncio.run(ml_service.predict_demand(df, params["forecast_days"]))
+    return df['quantity'].tolist(), predictions
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
@@ -66,58 +122,64 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 @app.post("/ai/demand-forecast", response_model=DemandForecastResponse)
-async def predict_demand(request: DemandForecastRequest, db: Session = Depends(get_db)):
+async def predict_demand(request: DemandForecastRequest, db: AsyncSession = Depends(db_manager.get_async_session_dependency)):
     """
     Predict future demand for products based on historical data
     """
     logger.info(f"Generating demand forecast for product {request.product_id}")
     
+    await hot_insights_refresher.record_request(request.product_id, {
+        "start_date": request.start_date.isoformat(),
+        "end_date": request.end_date.isoformat(),
+        "forecast_days": request.forecast_days
+    })
+    
     try:
-        from sqlalchemy import text
-        result = db.execute(text("""
-            SELECT 
-                oi.product_id,
-                p.name as product_name,
-                p.category,
-                o.created_at,
-                oi.quantity
-            FROM order_items oi
-            JOIN orders o ON oi.order_id = o.id
-            JOIN products p ON oi.product_id = p.id
-            WHERE o.created_at >= :start_date
-            AND o.created_at <= :end_date
-            AND oi.product_id = :product_id
-            ORDER BY o.created_at
-        """), {
-            "start_date": request.start_date,
-            "end_date": request.end_date,
-            "product_id": request.product_id
-        })
-        
-        data = result.fetchall()
-        
-        if not data:
-            logger.warning(f"No historical data found for product {request.product_id}")
-            return DemandForecastResponse(
-                product_id=request.product_id,
-                forecast_period=request.forecast_days,
-                predictions=ml_service._generate_default_predictions(request.forecast_days),
-                confidence_score=0.5,
-                model_used="default"
-            )
-        
-        import pandas as pd
-        df = pd.DataFrame([row._asdict() for row in data])
-        
-        predictions, confidence_score, model_used = await ml_service.predict_demand(
-            df, request.forecast_days
+        version = await data_watermarks.get(DataWatermarks.PRODUCTS, request.product_id)
+        cache_key = forecast_cache_key(
+            request.product_id, version, request.start_date, request.end_date, request.forecast_days
         )
+        forecast = await near_cache.get(cache_key)
         
-        historical_demand = df['quantity'].tolist()
-        ai_insights = await ai_service.get_demand_forecast_insights(historical_demand, predictions)
+        if forecast is None:
+            result = await db.execute(DEMAND_HISTORY_QUERY, {
+                "start_date": request.start_date,
+                "end_date": request.end_date,
+                "product_id": request.product_id
+            })
+            
+            data = result.fetchall()
+            
+            if not data:
+                logger.warning(f"No historical data found for product {request.product_id}")
+                return DemandForecastResponse(
+                    product_id=request.product_id,
+                    forecast_period=request.forecast_days,
+                    predictions=ml_service._generate_default_predictions(request.forecast_days),
+                    confidence_score=0.5,
+                    model_used="default"
+                )
+            
+            import pandas as pd
+            df = pd.DataFrame([row._asdict() for row in data])
+            
+            predictions, confidence_score, model_used = await ml_service.predict_demand(
+                df, request.forecast_days
+            )
+            forecast = {
+                "predictions": predictions,
+                "confidence_score": confidence_score,
+                "model_used": model_used,
+                "historical_demand": df['quantity'].tolist()
+            }
+            await near_cache.set(cache_key, forecast, ttl=settings.forecast_cache_ttl)
         
-        cache_key = f"demand_insights:{request.product_id}"
-        redis_manager.set(cache_key, ai_insights, ttl=settings.ai_model_cache_ttl)
+        predictions = forecast["predictions"]
+        confidence_score = forecast["confidence_score"]
+        model_used = forecast["model_used"]
+        historical_demand = forecast["historical_demand"]
+        prompt, context = ai_service.build_demand_forecast_request(historical_demand, predictions)
+        insights_job = await ai_service.submit_insights_job(prompt, context)
         
         logger.info(f"Demand forecast generated with confidence {confidence_score:.2f}")
         
@@ -127,7 +189,9 @@ async def predict_demand(request: DemandForecastRequest, db: Session = Depends(g
             predictions=predictions,
             confidence_score=confidence_score,
             model_used=model_used,
-            ai_insights=ai_insights
+            ai_insights=insights_job["insights"],
+            insights_status=insights_job["status"],
+            insights_job_id=insights_job["job_id"]
         )
         
     except Exception as e:
@@ -135,27 +199,22 @@ async def predict_demand(request: DemandForecastRequest, db: Session = Depends(g
         raise HTTPException(status_code=500, detail=f"Error generating demand forecast: {str(e)}")
 
 @app.post("/ai/inventory-optimization", response_model=InventoryOptimizationResponse)
-async def optimize_inventory(request: InventoryOptimizationRequest, db: Session = Depends(get_db)):
+async def optimize_inventory(request: InventoryOptimizationRequest, db: AsyncSession = Depends(db_manager.get_async_session_dependency)):
     """
     Optimize inventory levels based on demand patterns and cost factors
     """
     logger.info(f"Optimizing inventory for buyer {request.buyer_id}")
     
     try:
-        from sqlalchemy import text
-        result = db.execute(text("""
-            SELECT 
-                i.product_id,
-                p.name as product_name,
-                p.category,
-                i.current_stock,
-                i.min_stock_threshold,
-                p.price,
-                p.lead_time_days
-            FROM inventory i
-            JOIN products p ON i.product_id = p.id
-            WHERE i.buyer_id = :buyer_id
-        """), {"buyer_id": request.buyer_id})
+        version = await data_watermarks.get(DataWatermarks.BUYERS, request.buyer_id)
+        cache_key = data_watermarks.cache_key(
+            "inventory", request.buyer_id, version, ",".join(sorted(request.optimization_goals or []))
+        )
+        cached = await near_cache.get(cache_key)
+        if cached:
+            return InventoryOptimizationResponse(**cached)
+        
+        result = await db.execute(INVENTORY_QUERY, {"buyer_id": request.buyer_id})
         
         inventory_data = [row._asdict() for row in result.fetchall()]
         
@@ -172,86 +231,231 @@ async def optimize_inventory(request: InventoryOptimizationRequest, db: Session
         
         logger.info(f"Inventory optimization completed with score {optimization_result['optimization_score']:.2f}")
         
-        return InventoryOptimizationResponse(
+        response = InventoryOptimizationResponse(
             buyer_id=request.buyer_id,
             recommendations=optimization_result['recommendations'],
             total_cost_savings=optimization_result['total_cost_savings'],
             optimization_score=optimization_result['optimization_score']
         )
+        await near_cache.set(cache_key, response.model_dump(mode="json"), ttl=settings.inventory_cache_ttl)
+        return response
         
     except Exception as e:
         logger.error(f"Error optimizing inventory: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error optimizing inventory: {str(e)}")
 
+async def price_versions(product_id: str, competitor_ids: list) -> Tuple[int, str]:
+    """Versions of a product's own data and of the market data its price recommendation uses
+    
+    Competitor sales drive the recommendation, so new data for any chosen
+    competitor, or for the product's category when no index is loaded,
+    retires it too. Watermarks only grow, so their sum changes on any bump.
+    Both are read in one round-trip, with categories cached in-process.
+    """
+    if competitor_ids:
+        market = [(DataWatermarks.PRODUCTS, competitor_id) for competitor_id in competitor_ids]
+        competitor_set = hashlib.sha256(",".join(competitor_ids).encode("utf-8")).hexdigest()[:12]
+        label = f"competitors{competitor_set}."
+    else:
+        category = await product_categories.get(product_id)
+        market = [(DataWatermarks.CATEGORIES, category)] if category else []
+        label = "category"
+    versions = await data_watermarks.get_versions([(DataWatermarks.PRODUCTS, product_id), *market])
+    return versions[0], f"{label}{sum(versions[1:])}"
+
 @app.post("/ai/price-recommendations", response_model=PriceRecommendationResponse)
-async def get_price_recommendations(request: PriceRecommendationRequest, db: Session = Depends(get_db)):
+async def get_price_recommendations(request: PriceRecommendationRequest):
     """
     Provide price recommendations for suppliers based on market analysis
     """
     logger.info(f"Generating price recommendations for product {request.product_id}")
     
     try:
-        from sqlalchemy import text
-        result = db.execute(text("""
-            SELECT 
-                p.id,
-                p.name,
-                p.category,
-                p.price,
-                AVG(oi.quantity) as avg_quantity_sold,
-                COUNT(oi.id) as order_count
-            FROM products p
-            LEFT JOIN order_items oi ON p.id = oi.product_id
-            WHERE p.category = (
-                SELECT category FROM products WHERE id = :product_id
-            )
-            AND p.id != :product_id
-            GROUP BY p.id, p.name, p.category, p.price
-            HAVING COUNT(oi.id) > 0
-            ORDER BY AVG(oi.quantity) DESC
-            LIMIT 10
-        """), {"product_id": request.product_id})
+        competitor_ids = competitor_index.query(request.product_id, settings.competitor_index_k)
+        version, market_version = await price_versions(request.product_id, competitor_ids)
+        cache_key = data_watermarks.cache_key(
+            "price",
+            request.product_id,
+            version,
+            market_version,
+            request.market_analysis_depth
+        )
+        cached = await near_cache.get(cache_key)
+        if cached:
+            return PriceRecommendationResponse(**cached)
         
-        market_data = [row._asdict() for row in result.fetchall()]
+        if competitor_ids:
+            market_query = db_manager.fetch_all(text("""
+                SELECT 
+                    p.id,
+                    p.name,
+                    p.category,
+                    p.price,
+                    AVG(oi.quantity) as avg_quantity_sold,
+                    COUNT(oi.id) as order_count
+                FROM products p
+                LEFT JOIN order_items oi ON p.id = oi.product_id
+                WHERE p.id::text = ANY(:competitor_ids)
+                GROUP BY p.id, p.name, p.category, p.price
+            """), {"competitor_ids": competitor_ids})
+        else:
+            market_query = db_manager.fetch_all(text("""
+                SELECT 
+                    p.id,
+                    p.name,
+                    p.category,
+                    p.price,
+                    AVG(oi.quantity) as avg_quantity_sold,
+                    COUNT(oi.id) as order_count
+                FROM products p
+                LEFT JOIN order_items oi ON p.id = oi.product_id
+                WHERE p.category = (
+                    SELECT category FROM products WHERE id = :product_id
+                )
+                AND p.id != :product_id
+                GROUP BY p.id, p.name, p.category, p.price
+                HAVING COUNT(oi.id) > 0
+                ORDER BY AVG(oi.quantity) DESC
+                LIMIT 10
+            """), {"product_id": request.product_id})
         
-        current_product_result = db.execute(text("""
+        current_price_query = db_manager.fetch_all(text("""
             SELECT price FROM products WHERE id = :product_id
         """), {"product_id": request.product_id})
         
-        current_price_row = current_product_result.fetchone()
-        current_price = float(current_price_row.price) if current_price_row else 0
+        # Independent queries, each in its own session, run concurrently
+        market_data, current_price_rows = await asyncio.gather(market_query, current_price_query)
+        current_price = float(current_price_rows[0]['price']) if current_price_rows else 0
         
         recommendation_result = ml_service.get_price_recommendations(market_data, current_price)
         
         logger.info(f"Price recommendations generated for product {request.product_id}")
         
-        return PriceRecommendationResponse(
+        response = PriceRecommendationResponse(
             product_id=request.product_id,
             current_price=recommendation_result['current_price'],
             recommended_price=recommendation_result['recommended_price'],
             market_analysis=recommendation_result['market_analysis'],
             recommendations=recommendation_result['recommendations']
         )
+        await near_cache.set(cache_key, response.model_dump(mode="json"), ttl=settings.price_cache_ttl)
+        return response
         
     except Exception as e:
         logger.error(f"Error generating price recommendations: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error generating price recommendations: {str(e)}")
 
+@app.post("/ai/price-simulation", response_model=PriceSimulationResponse)
+async def simulate_prices(request: PriceSimulationRequest, db: AsyncSession = Depends(db_manager.get_async_session_dependency)):
+    """
+    Evaluate projected volume and revenue over a grid of candidate prices
+    """
+    logger.info(f"Simulating {request.grid_points} price points for product {request.product_id}")
+    
+    if request.grid_points < 2 or request.grid_points > settings.price_simulation_max_grid_points:
+        raise HTTPException(
+            status_code=400,
+            detail=f"grid_points must be between 2 and {settings.price_simulation_max_grid_points}"
+        )
+    
+    try:
+        result = await db.execute(text("""
+            SELECT 
+                p.id,
+                p.price,
+                AVG(oi.quantity) as avg_quantity_sold,
+                COUNT(oi.id) as order_count
+            FROM products p
+            LEFT JOIN order_items oi ON p.id = oi.product_id
+            WHERE p.category = (
+                SELECT category FROM products WHERE id = :product_id
+            )
+            GROUP BY p.id, p.price
+        """), {"product_id": request.product_id})
+        
+        category_data = [row._asdict() for row in result.fetchall()]
+        
+        current_row = next((row for row in category_data if str(row['id']) == request.product_id), None)
+        if current_row is None:
+            raise HTTPException(status_code=404, detail=f"Product {request.product_id} not found")
+        
+        current_price = float(current_row['price'])
+        current_volume = float(current_row['avg_quantity_sold'] or 0)
+        market_data = [row for row in category_data if row is not current_row and row['order_count'] > 0]
+        
+        min_price = request.min_price if request.min_price is not None else current_price * 0.5
+        max_price = request.max_price if request.max_price is not None else current_price * 1.5
+        if min_price <= 0 or max_price <= min_price:
+            raise HTTPException(status_code=400, detail="Price range must be positive and non-empty")
+        
+        simulation = ml_service.simulate_price_grid(
+            market_data,
+            current_price,
+            current_volume,
+            min_price,
+            max_price,
+            request.grid_points,
+            request.unit_cost
+        )
+        
+        logger.info(f"Price simulation for product {request.product_id} found optimum at {simulation['optimal_price']:.2f}")
+        
+        return PriceSimulationResponse(product_id=request.product_id, **simulation)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error simulating prices: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error simulating prices: {str(e)}")
+
 @app.get("/ai/cache/clear")
-async def clear_cache():
-    """Clear AI model cache"""
-    logger.info("Clearing AI model cache")
+async def clear_cache(namespace: Optional[str] = None):
+    """Clear AI model cache, or only the keys under one namespace.
+    
+    Namespaces are key prefixes within the AI cache, such as ai_insights,
+    forecast:{product_id} or price:{product_id}. Without one, all AI cache
+    namespaces are cleared. Other keys, such as the job queue, event
+    streams and watermarks, are never touched.
+    """
+    if namespace and namespace.split(":", 1)[0] not in AI_CACHE_NAMESPACES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"namespace must be one of {AI_CACHE_NAMESPACES} or a prefix under one of them"
+        )
+    namespaces = [namespace] if namespace else AI_CACHE_NAMESPACES
+    logger.info(f"Clearing AI model cache namespaces {namespaces}")
     
     try:
-        success = redis_manager.flush_db()
-        if success:
-            return {"message": "Cache cleared successfully", "timestamp": datetime.now().isoformat()}
-        else:
-            raise HTTPException(status_code=500, detail="Failed to clear cache")
+        deleted = 0
+        for ns in namespaces:
+            count = await redis_manager.delete_namespace(ns, settings.cache_invalidation_batch_size)
+            if count is None:
+                raise HTTPException(status_code=500, detail=f"Failed to clear cache namespace {ns}")
+            deleted += count
+        
+        await near_cache.invalidate(namespaces=namespaces)
+        return {
+            "message": "Cache cleared successfully",
+            "namespaces": namespaces,
+            "deleted_keys": deleted,
+            "timestamp": datetime.now().isoformat()
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error clearing cache: {e}")
         raise HTTPException(status_code=500, detail=f"Error clearing cache: {str(e)}")
 
+@app.get("/ai/cache/metrics")
+async def get_cache_metrics(hot_keys: int = 20):
+    """Get per-namespace cache hit rates, latency and value sizes, and the hottest keys"""
+    return {
+        **redis_manager.get_cache_metrics(hot_keys),
+        "near_cache": near_cache.get_stats(),
+        "cache_refresh": redis_manager.get_refresh_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 @app.post("/ai/groq-insights")
 async def get_groq_business_insights(request: dict):
     """Get AI-powered business insights using Groq"""
@@ -264,12 +468,12 @@ async def get_groq_business_insights(request: dict):
     logger.info(f"Generating AI insights for prompt: {prompt[:100]}...")
     
     try:
-        insights = await ai_service.get_business_insights(prompt, context)
+        insights = await ai_service.get_business_insights(prompt, context, semantic=True)
         
         return {
             "insights": insights,
             "timestamp": datetime.now().isoformat(),
-            "model_used": "llama-3.3-70b-versatile",
+            "model_used": settings.groq_model,
             "ai_service_available": ai_service.is_available()
         }
         
@@ -277,12 +481,106 @@ async def get_groq_business_insights(request: dict):
         logger.error(f"Error getting AI insights: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error getting AI insights: {str(e)}")
 
+@app.post("/ai/groq-insights/stream")
+async def stream_groq_business_insights(request: dict):
+    """Stream AI-powered business insights as server-sent events"""
+    prompt = request.get("prompt", "")
+    context = request.get("context", {})
+    
+    if not prompt:
+        raise HTTPException(status_code=400, detail="Prompt is required")
+    
+    logger.info(f"Streaming AI insights for prompt: {prompt[:100]}...")
+    
+    async def event_stream():
+        try:
+            async for delta in ai_service.stream_business_insights(prompt, context, semantic=True):
+                yield f"data: {json.dumps({'content': delta})}\n\n"
+            yield f"event: done\ndata: {json.dumps({'model_used': settings.groq_model})}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming AI insights: {e}", exc_info=True)
+            yield f"event: error\ndata: {json.dumps({'message': str(e)})}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/ai/insights/{job_id}", response_model=InsightsJobResponse)
+async def get_insights_job(job_id: str):
+    """Fetch the status and result of a background insights job"""
+    job = await ai_service.get_insights_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Insights job {job_id} not found")
+    return InsightsJobResponse(**job)
+
+JOB_PAYLOAD_MODELS = {
+    "demand_forecast": DemandForecastRequest,
+    "inventory_optimization": InventoryOptimizationRequest,
+    "insights": BusinessInsightsRequest,
+}
+
+@app.post("/ai/jobs", response_model=JobStatusResponse, status_code=202)
+async def enqueue_job(request: JobRequest):
+    """Queue a forecasting, optimization or insights job for the worker pool"""
+    try:
+        payload = JOB_PAYLOAD_MODELS[request.job_type](**request.payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid {request.job_type} payload: {e}")
+    
+    try:
+        job = await job_queue.enqueue(request.job_type, payload.model_dump(mode="json"), request.max_attempts)
+    except Exception as e:
+        logger.error(f"Error queueing {request.job_type} job: {e}")
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {str(e)}")
+    
+    return JobStatusResponse(**job)
+
+async def load_job(job_id: str) -> dict:
+    """Look up a job record, mapping a missing record to 404 and a Redis outage to 503"""
+    try:
+        job = await job_queue.get_job(job_id)
+    except Exception as e:
+        logger.error(f"Error loading job {job_id}: {e}")
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
+
+@app.get("/ai/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job_status(job_id: str):
+    """Get the status of a queued job"""
+    return JobStatusResponse(**await load_job(job_id))
+
+@app.get("/ai/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """Get the result of a completed job"""
+    job = await load_job(job_id)
+    if job["status"] == JobQueue.FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+    if job["status"] != JobQueue.COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return {"job_id": job_id, "job_type": job["job_type"], "result": job["result"]}
+
 @app.get("/ai/status")
 async def get_ai_service_status():
     """Check AI service status"""
     return {
         "ai_service_available": ai_service.is_available(),
-        "redis_available": redis_manager.health_check(),
+        "redis_available": redis_manager.is_available(),
+        "redis_circuit": redis_manager.get_circuit_status(),
+        "redis_pool": redis_manager.get_pool_stats(),
+        "redis_cache_nodes": redis_manager.ring.nodes,
+        "insights_cache": ai_service.get_cache_stats(),
+        "near_cache": near_cache.get_stats(),
+        "cache_refresh": redis_manager.get_refresh_stats(),
+        "event_consumer": event_consumer.get_stats(),
+        "product_categories": product_categories.stats,
+        "llm_usage": ai_service.get_llm_stats(),
+        "llm_rate_limiter": ai_service.rate_limiter.get_metrics(),
+        "llm_circuit": ai_service.circuit_breaker.get_status(),
+        "semantic_cache": ai_service.semantic_cache.get_stats() if ai_service.semantic_cache else None,
         "timestamp": datetime.now().isoformat()
     }
 
@@ -295,7 +593,7 @@ async def health_check():
         "version": settings.app_version,
         "services": {
             "database": "connected",
-            "redis": "connected" if redis_manager.health_check() else "disconnected",
+            "redis": "connected" if redis_manager.is_available() else "disconnected",
             "ai_service": "available" if ai_service.is_available() else "unavailable"
         }
     }
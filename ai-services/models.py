@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Literal, Optional
 from datetime import datetime, date
 
 class DemandForecastRequest(BaseModel):
@@ -19,6 +19,14 @@ class DemandForecastResponse(BaseModel):
     confidence_score: float
     model_used: str
     ai_insights: Optional[str] = None
+    insights_status: Optional[str] = None
+    insights_job_id: Optional[str] = None
+
+class InsightsJobResponse(BaseModel):
+    job_id: str
+    status: str
+    insights: Optional[str] = None
+    error: Optional[str] = None
 
 class InventoryOptimizationRequest(BaseModel):
     buyer_id: str
@@ -55,6 +63,50 @@ class PriceRecommendationResponse(BaseModel):
     market_analysis: Dict[str, Any]
     recommendations: List[PriceRecommendation]
 
+class PriceSimulationRequest(BaseModel):
+    product_id: str
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    grid_points: int = 100
+    unit_cost: Optional[float] = None
+
+class PriceCurve(BaseModel):
+    prices: List[float]
+    projected_volume: List[float]
+    projected_revenue: List[float]
+    projected_profit: Optional[List[float]] = None
+
+class PriceSimulationResponse(BaseModel):
+    product_id: str
+    current_price: float
+    price_elasticity: float
+    demand_model: str
+    curve: PriceCurve
+    optimal_price: float
+    optimal_volume: float
+    optimal_revenue: float
+    optimal_profit: Optional[float] = None
+
+class BusinessInsightsRequest(BaseModel):
+    prompt: str
+    context: Dict[str, Any] = {}
+
+class JobRequest(BaseModel):
+    job_type: Literal["demand_forecast", "inventory_optimization", "insights"]
+    payload: Dict[str, Any]
+    max_attempts: Optional[int] = None
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    job_type: str
+    status: str
+    attempts: int
+    max_attempts: int
+    error: Optional[str] = None
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
 class AIServiceHealth(BaseModel):
     status: str
     timestamp: str
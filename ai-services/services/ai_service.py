@@ -1,96 +1,528 @@
 """AI service for business intelligence and insights."""
+import asyncio
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import re
+import textwrap
+import time
+from typing import Dict, Any, AsyncIterator, Awaitable, Callable, List, Optional, Set, Tuple
 import json
 
+import httpx
+
 from config.settings import settings
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from core.rate_limiter import RateLimiter
+from core.near_cache import near_cache
 from core.redis_client import redis_manager
+from services.insight_fallback import generate_fallback_insights
+from services.prompt_compaction import compact_context, dumps_compact, estimate_tokens, summarize_series
+from services.semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Insights job ids are the SHA-256 digests in their cache keys
+_JOB_ID_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+BUSINESS_INSIGHTS_TEMPLATE = """You are an AI business analyst for Cesto AI, a food & beverage B2B platform.
+
+Context: {context}
+
+Question/Analysis: {prompt}
+
+Please provide:
+1. Key insights
+2. Recommendations
+3. Potential risks or opportunities
+
+Keep the response concise and actionable."""
+
+DEMAND_FORECAST_PROMPT = """Analyze this demand forecasting data and provide insights:
+- What patterns do you see in the historical data?
+- Are the predictions realistic based on the historical trends?
+- What factors might influence future demand?
+- Any recommendations for inventory management?"""
+
 
 class AIService:
     """AI service for generating business insights."""
     
+    INSIGHTS_PARAMS = {"temperature": 0.7, "max_tokens": 500}
+    
     def __init__(self):
-        self.groq_client = None
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(settings.groq_max_concurrency)
+        self.semantic_cache = SemanticCache(
+            settings.semantic_cache_size,
+            settings.semantic_cache_dimensions,
+            settings.semantic_cache_threshold
+        ) if settings.semantic_cache_enabled else None
+        if self.semantic_cache:
+            near_cache.on_clear(self._on_cache_clear)
+        self.circuit_breaker = CircuitBreaker(
+            "groq",
+            settings.groq_breaker_failure_threshold,
+            settings.groq_breaker_reset_timeout
+        )
+        self.rate_limiter = RateLimiter(
+            "groq",
+            settings.groq_requests_per_minute,
+            settings.groq_tokens_per_minute
+        )
+        self.cache_stats = {"hits": 0, "misses": 0, "coalesced": 0}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._background_jobs: Set[asyncio.Task] = set()
+        self.llm_stats = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "latency_seconds": 0.0}
         self._initialize_groq()
     
+    def _on_cache_clear(self, namespaces: Optional[List[str]]):
+        """Drop semantic matches whenever cached insights are cleared in any worker."""
+        if namespaces is None or any(ns.split(":")[0] == "ai_insights" for ns in namespaces):
+            self.semantic_cache.clear()
+            logger.info("Semantic insights cache cleared")
+    
     def _initialize_groq(self):
-        """Initialize Groq AI client."""
+        """Initialize the pooled async HTTP client for the Groq API."""
         if not settings.groq_api_key:
             logger.warning("Groq API key not configured")
             return
         
         try:
-            from groq import Groq
-            self.groq_client = Groq(api_key=settings.groq_api_key)
+            self.http_client = httpx.AsyncClient(
+                base_url=settings.groq_base_url,
+                headers={"Authorization": f"Bearer {settings.groq_api_key}"},
+                timeout=httpx.Timeout(settings.groq_timeout, connect=settings.groq_connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=settings.groq_max_connections,
+                    max_keepalive_connections=settings.groq_max_keepalive_connections,
+                    keepalive_expiry=settings.groq_keepalive_expiry,
+                ),
+            )
             logger.info("Groq AI client initialized successfully")
-        except ImportError:
-            logger.error("Groq library not available. Install with: pip install groq")
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
     
+    async def _chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        timeout: Optional[float] = None,
+        response_format: Optional[Dict[str, str]] = None,
+        priority: int = RateLimiter.INTERACTIVE
+    ) -> str:
+        """Run a chat completion without blocking the event loop."""
+        payload = self._completion_payload(messages, temperature, max_tokens)
+        if response_format:
+            payload["response_format"] = response_format
+        request_timeout = timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        
+        await self._acquire_call(messages, max_tokens, priority)
+        resolved = False
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                response = await self.http_client.post(
+                    "/chat/completions",
+                    json=payload,
+                    timeout=request_timeout
+                )
+                latency = time.perf_counter() - started
+            response.raise_for_status()
+            self.circuit_breaker.record_success()
+            resolved = True
+        except httpx.HTTPError as e:
+            self._record_failure(e)
+            resolved = True
+            raise
+        finally:
+            if not resolved:
+                self.circuit_breaker.release_trial()
+        
+        data = response.json()
+        self._record_usage(data.get("usage", {}), latency)
+        return data["choices"][0]["message"]["content"]
+    
+    async def _stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: int = 500,
+        priority: int = RateLimiter.INTERACTIVE
+    ) -> AsyncIterator[str]:
+        """Stream chat completion tokens as they are generated."""
+        payload = self._completion_payload(messages, temperature, max_tokens, stream=True)
+        
+        await self._acquire_call(messages, max_tokens, priority)
+        resolved = False
+        try:
+            async with self._semaphore:
+                async with self.http_client.stream("POST", "/chat/completions", json=payload) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        delta = json.loads(data)["choices"][0]["delta"].get("content")
+                        if delta:
+                            yield delta
+            self.circuit_breaker.record_success()
+            resolved = True
+        except httpx.HTTPError as e:
+            self._record_failure(e)
+            resolved = True
+            raise
+        finally:
+            # Covers cancellation, client disconnects and unparseable responses
+            if not resolved:
+                self.circuit_breaker.release_trial()
+    
+    async def _acquire_call(self, messages: List[Dict[str, str]], max_tokens: int, priority: int):
+        """Wait for rate limit capacity, failing fast while the Groq circuit is open.
+        
+        The half-open trial is only claimed once the limiter lets the call
+        through, so other calls are not rejected while a trial is queued.
+        """
+        if self.circuit_breaker.is_open():
+            raise CircuitOpenError("Groq circuit is open")
+        await self.rate_limiter.acquire(self._estimate_call_tokens(messages, max_tokens), priority)
+        self._check_circuit()
+    
+    def _check_circuit(self):
+        """Fail fast while the Groq circuit is open."""
+        if not self.circuit_breaker.allow_request():
+            raise CircuitOpenError("Groq circuit is open")
+    
+    def _record_failure(self, error: httpx.HTTPError):
+        """Count provider-side failures towards opening the circuit.
+        
+        Client errors other than 429 mean Groq answered, so they count as
+        proof that it is up.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            if status < 500 and status != 429:
+                self.circuit_breaker.record_success()
+                return
+        self.circuit_breaker.record_failure()
+    
+    def _estimate_call_tokens(self, messages: List[Dict[str, str]], max_tokens: int) -> int:
+        """Estimate the tokens a call will consume against the tokens/min limit."""
+        return sum(estimate_tokens(message["content"]) for message in messages) + max_tokens
+    
+    def _record_usage(self, usage: Dict[str, Any], latency: float):
+        """Accumulate token usage and latency of completed LLM calls."""
+        self.llm_stats["calls"] += 1
+        self.llm_stats["prompt_tokens"] += usage.get("prompt_tokens", 0)
+        self.llm_stats["completion_tokens"] += usage.get("completion_tokens", 0)
+        self.llm_stats["latency_seconds"] += latency
+    
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """Get average input tokens and latency per LLM call for this worker."""
+        calls = self.llm_stats["calls"]
+        return {
+            **self.llm_stats,
+            "avg_prompt_tokens": self.llm_stats["prompt_tokens"] / calls if calls else 0.0,
+            "avg_latency_seconds": self.llm_stats["latency_seconds"] / calls if calls else 0.0
+        }
+    
+    def _completion_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """Build the request body for the chat completions endpoint."""
+        payload = {
+            "model": settings.groq_model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+    
     async def get_business_insights(
         self, 
         prompt: str, 
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        priority: int = RateLimiter.INTERACTIVE,
+        semantic: bool = False
     ) -> str:
-        """Get AI-powered business insights."""
-        if not self.groq_client:
+        """Get AI-powered business insights.
+        
+        With semantic set, paraphrases of previously answered free-form
+        prompts are served from the local semantic cache.
+        """
+        if not self.http_client:
             return "AI service not available"
         
         try:
-            # Check cache first
-            cache_key = f"ai_insights:{hash(prompt)}"
-            cached_result = redis_manager.get(cache_key)
-            if cached_result:
-                logger.debug("Returning cached AI insights")
-                return cached_result
-            
-            # Generate insights
-            full_prompt = self._build_prompt(prompt, context)
-            
-            response = self.groq_client.chat.completions.create(
-                model="llama-3.3-70b-versatile",
-                messages=[{"role": "user", "content": full_prompt}],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            insights = response.choices[0].message.content
+            return await self._get_or_generate_insights(prompt, context, priority, semantic)
+        
+        except CircuitOpenError:
+            logger.debug("Groq circuit open, returning fallback insights")
+            return generate_fallback_insights(context)
+        except Exception as e:
+            logger.error(f"Error generating AI insights, returning fallback: {e}")
+            return generate_fallback_insights(context)
+    
+    async def stream_business_insights(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None,
+        semantic: bool = False
+    ) -> AsyncIterator[str]:
+        """Stream AI-powered business insights, replaying cached results at once."""
+        if not self.http_client:
+            yield "AI service not available"
+            return
+        
+        full_prompt = self._build_prompt(prompt, context)
+        cache_key = self._cache_key(full_prompt, context, self.INSIGHTS_PARAMS)
+        cached_result = await near_cache.get(cache_key)
+        if cached_result:
+            self.cache_stats["hits"] += 1
+            yield cached_result
+            return
+        self.cache_stats["misses"] += 1
+        
+        if semantic and self.semantic_cache:
+            context_digest = self.semantic_cache.context_digest(settings.groq_model, context)
+            similar_result = self.semantic_cache.lookup(prompt, context_digest)
+            if similar_result:
+                yield similar_result
+                return
+        
+        parts = []
+        try:
+            async for delta in self._stream_chat_completion(
+                [{"role": "user", "content": full_prompt}],
+                **self.INSIGHTS_PARAMS
+            ):
+                parts.append(delta)
+                yield delta
+        except Exception as e:
+            if parts:
+                raise
+            logger.error(f"Error streaming AI insights, returning fallback: {e}")
+            yield generate_fallback_insights(context)
+            return
+        
+        # Only complete streams are cached
+        insights = "".join(parts)
+        await near_cache.set(cache_key, insights, ttl=settings.ai_model_cache_ttl)
+        if semantic and self.semantic_cache:
+            self.semantic_cache.store(prompt, context_digest, insights)
+        logger.info("Generated new streamed AI insights")
+    
+    async def _get_or_generate_insights(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]],
+        priority: int = RateLimiter.INTERACTIVE,
+        semantic: bool = False
+    ) -> str:
+        """Return cached insights or generate them, raising on failure."""
+        full_prompt = self._build_prompt(prompt, context)
+        cache_key = self._cache_key(full_prompt, context, self.INSIGHTS_PARAMS)
+        return await self._single_flight(
+            cache_key,
+            lambda: self._get_cached_insights(cache_key, prompt, full_prompt, context, priority, semantic)
+        )
+    
+    async def _get_cached_insights(
+        self,
+        cache_key: str,
+        prompt: str,
+        full_prompt: str,
+        context: Optional[Dict[str, Any]],
+        priority: int,
+        semantic: bool
+    ) -> str:
+        """Read insights through the near cache, generating them once across workers when due."""
+        generated = False
+        
+        async def generate() -> str:
+            nonlocal generated
+            generated = True
             
-            # Cache the result
-            redis_manager.set(
-                cache_key, 
-                insights, 
-                ttl=settings.ai_model_cache_ttl
-            )
+            if semantic and self.semantic_cache:
+                context_digest = self.semantic_cache.context_digest(settings.groq_model, context)
+                similar_result = self.semantic_cache.lookup(prompt, context_digest)
+                if similar_result:
+                    return similar_result
             
-            logger.info("Generated new AI insights")
+            insights = await self._generate_insights(full_prompt, priority)
+            if semantic and self.semantic_cache:
+                self.semantic_cache.store(prompt, context_digest, insights)
             return insights
-            
-        except Exception as e:
-            logger.error(f"Error generating AI insights: {e}")
-            return f"Error generating insights: {str(e)}"
+        
+        insights = await near_cache.get_or_compute(
+            cache_key,
+            generate,
+            ttl=settings.ai_model_cache_ttl,
+            stale_ttl=settings.ai_insights_stale_ttl,
+            beta=settings.ai_insights_refresh_beta,
+            lease_ttl=settings.ai_insights_lock_ttl,
+            lease_wait=settings.ai_insights_lock_wait,
+            poll_interval=settings.ai_insights_lock_poll_interval
+        )
+        # Background refreshes finish after this, so stale values count as hits
+        self.cache_stats["misses" if generated else "hits"] += 1
+        return insights
     
-    def _build_prompt(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
-        """Build the full prompt with context."""
-        base_prompt = f"""
-        You are an AI business analyst for Cesto AI, a food & beverage B2B platform.
+    async def submit_insights_job(
+        self,
+        prompt: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Start generating insights in the background and return a job handle."""
+        full_prompt = self._build_prompt(prompt, context)
+        cache_key = self._cache_key(full_prompt, context, self.INSIGHTS_PARAMS)
+        job_id = cache_key.split(":", 1)[1]
         
-        Context: {json.dumps(context, indent=2) if context else "No additional context"}
+        cached_result = await near_cache.get(cache_key)
+        if cached_result:
+            self.cache_stats["hits"] += 1
+            return {"job_id": job_id, "status": "ready", "insights": cached_result}
         
-        Question/Analysis: {prompt}
+        if not self.http_client:
+            return {"job_id": None, "status": "unavailable", "insights": None}
         
-        Please provide:
-        1. Key insights
-        2. Recommendations
-        3. Potential risks or opportunities
+        if self.circuit_breaker.is_open():
+            return {"job_id": None, "status": "fallback", "insights": generate_fallback_insights(context)}
         
-        Keep the response concise and actionable.
+        job_key = f"ai_insights_job:{job_id}"
+        if cache_key not in self._inflight:
+            await redis_manager.set(job_key, {"status": "pending"}, ttl=settings.ai_model_cache_ttl)
+            task = asyncio.ensure_future(self._run_insights_job(job_key, prompt, context))
+            self._background_jobs.add(task)
+            task.add_done_callback(self._background_jobs.discard)
+        
+        return {"job_id": job_id, "status": "pending", "insights": None}
+    
+    async def _run_insights_job(
+        self,
+        job_key: str,
+        prompt: str,
+        context: Optional[Dict[str, Any]]
+    ):
+        """Generate insights for a background job and record its outcome."""
+        try:
+            await self._get_or_generate_insights(prompt, context, RateLimiter.BACKGROUND)
+            await redis_manager.delete(job_key)
+        except Exception as e:
+            logger.error(f"Background AI insights job failed, storing fallback: {e}")
+            await redis_manager.set(
+                job_key,
+                {"status": "fallback", "error": str(e), "insights": generate_fallback_insights(context)},
+                ttl=settings.ai_model_cache_ttl
+            )
+    
+    async def get_insights_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a background insights job by id.
+        
+        Anything but a digest is unknown, so ids can't name other keys.
         """
-        return base_prompt
+        if not _JOB_ID_PATTERN.fullmatch(job_id):
+            return None
+        
+        cached_result = await near_cache.get(f"ai_insights:{job_id}")
+        if cached_result:
+            return {"job_id": job_id, "status": "ready", "insights": cached_result}
+        
+        job = await redis_manager.get(f"ai_insights_job:{job_id}")
+        if not job:
+            return None
+        
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "insights": job.get("insights"),
+            "error": job.get("error")
+        }
+    
+    async def _single_flight(self, key: str, factory: Callable[[], Awaitable[str]]) -> str:
+        """Coalesce concurrent calls for the same key onto one in-flight task."""
+        task = self._inflight.get(key)
+        if task is not None:
+            self.cache_stats["coalesced"] += 1
+            logger.debug(f"Joining in-flight AI insights request for {key}")
+        else:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # Shield so one cancelled caller does not abort the call for the others
+        return await asyncio.shield(task)
+    
+    async def _generate_insights(self, full_prompt: str, priority: int) -> str:
+        """Call the LLM for insights."""
+        insights = await self._chat_completion(
+            [{"role": "user", "content": full_prompt}],
+            priority=priority,
+            **self.INSIGHTS_PARAMS
+        )
+        logger.info("Generated new AI insights")
+        return insights
+    
+    def _cache_key(
+        self,
+        full_prompt: str,
+        context: Optional[Dict[str, Any]],
+        params: Dict[str, Any]
+    ) -> str:
+        """Build a content-addressed cache key stable across processes."""
+        material = json.dumps(
+            {
+                "model": settings.groq_model,
+                "params": params,
+                "prompt": full_prompt,
+                "context": context,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return f"ai_insights:{hashlib.sha256(material.encode('utf-8')).hexdigest()}"
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get insight cache hit/miss counters for this worker."""
+        lookups = self.cache_stats["hits"] + self.cache_stats["misses"]
+        return {
+            **self.cache_stats,
+            "hit_rate": self.cache_stats["hits"] / lookups if lookups else 0.0
+        }
+    
+    def _build_prompt(self, prompt: str, context: Optional[Dict[str, Any]]) -> str:
+        """Build the full prompt with a compacted context."""
+        compacted = compact_context(
+            context,
+            settings.ai_prompt_token_budget,
+            buckets=settings.ai_prompt_series_buckets
+        )
+        return BUSINESS_INSIGHTS_TEMPLATE.format(context=compacted, prompt=textwrap.dedent(prompt).strip())
+    
+    def build_demand_forecast_request(
+        self,
+        historical_data: list,
+        predictions: list
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the prompt and context used for demand forecast insights."""
+        context = {
+            "historical_demand": summarize_series(historical_data[-30:], settings.ai_prompt_series_buckets),
+            "forecast": summarize_series(
+                [p["predicted_demand"] for p in predictions],
+                settings.ai_prompt_series_buckets
+            ),
+            "data_points": len(historical_data)
+        }
+        return DEMAND_FORECAST_PROMPT, context
     
     async def get_demand_forecast_insights(
         self, 
@@ -98,21 +530,123 @@ class AIService:
         predictions: list
     ) -> str:
         """Get AI insights for demand forecasting."""
-        context = {
-            "historical_demand": historical_data[-30:] if len(historical_data) > 30 else historical_data,
-            "predictions": predictions,
-            "data_points": len(historical_data)
-        }
+        prompt, context = self.build_demand_forecast_request(historical_data, predictions)
+        return await self.get_business_insights(prompt, context)
+    
+    async def get_batch_demand_forecast_insights(
+        self,
+        items: List[Dict[str, Any]],
+        refresh_within: Optional[int] = None
+    ) -> Dict[str, str]:
+        """Generate demand forecast insights for many products with few LLM calls.
         
-        prompt = """
-        Analyze this demand forecasting data and provide insights:
-        - What patterns do you see in the historical data?
-        - Are the predictions realistic based on the historical trends?
-        - What factors might influence future demand?
-        - Any recommendations for inventory management?
+        Each item carries product_id, historical_data and predictions. Results
+        are written to the same cache entries get_demand_forecast_insights
+        reads, so later single-product lookups are cache hits. With
+        refresh_within, cached entries expiring within that many seconds are
+        regenerated ahead of time.
         """
+        results = {}
+        pending = []
         
-        return await self.get_business_insights(prompt, context)
+        requests = []
+        for item in items:
+            prompt, context = self.build_demand_forecast_request(item["historical_data"], item["predictions"])
+            cache_key = self._cache_key(self._build_prompt(prompt, context), context, self.INSIGHTS_PARAMS)
+            requests.append((str(item["product_id"]), cache_key, context))
+        
+        cache_keys = [cache_key for _, cache_key, _ in requests]
+        cached = await near_cache.get_many(cache_keys)
+        ttls = await redis_manager.fresh_ttl_many(cache_keys) if refresh_within else {}
+        
+        for product_id, cache_key, context in requests:
+            cached_result = cached.get(cache_key)
+            if cached_result and not (refresh_within and ttls.get(cache_key, -2) < refresh_within):
+                self.cache_stats["hits"] += 1
+                results[product_id] = cached_result
+                continue
+            self.cache_stats["misses"] += 1
+            pending.append((product_id, cache_key, dumps_compact(context)))
+        
+        if not pending or not self.http_client:
+            return results
+        
+        for batch in self._pack_batches(pending):
+            try:
+                started = time.perf_counter()
+                insights = await self._generate_batch_insights(batch)
+                delta = time.perf_counter() - started
+                if not isinstance(insights, dict):
+                    raise ValueError(f"expected a JSON object, got {type(insights).__name__}")
+            except Exception as e:
+                logger.error(f"Error generating batch AI insights: {e}")
+                continue
+            
+            generated = {}
+            for product_id, cache_key, _ in batch:
+                insight = insights.get(product_id)
+                if isinstance(insight, str) and insight:
+                    generated[cache_key] = insight
+                    results[product_id] = insight
+            # Same entry layout as get_or_compute, so single-product reads don't see a stale expiry
+            await near_cache.store_computed(
+                generated,
+                ttl=settings.ai_model_cache_ttl,
+                stale_ttl=settings.ai_insights_stale_ttl,
+                delta=delta
+            )
+        
+        logger.info(f"Generated batch AI insights for {len(results)} of {len(items)} products")
+        return results
+    
+    def _pack_batches(self, pending: List[Tuple[str, str, str]]) -> List[List[Tuple[str, str, str]]]:
+        """Group product summaries into batches under the prompt token budget."""
+        batches = []
+        current = []
+        current_tokens = 0
+        
+        for entry in pending:
+            tokens = estimate_tokens(entry[2]) + estimate_tokens(entry[0])
+            if current and (
+                current_tokens + tokens > settings.ai_batch_prompt_token_budget
+                or len(current) >= settings.ai_batch_max_products
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(entry)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _generate_batch_insights(self, batch: List[Tuple[str, str, str]]) -> Dict[str, Any]:
+        """Ask for structured per-product insights for one batch."""
+        lines = "\n".join(f"{product_id}: {summary}" for product_id, _, summary in batch)
+        prompt = f"""
+        You are an AI business analyst for Cesto AI, a food & beverage B2B platform.
+        
+        Below are demand summaries, one product per line as "product_id: summary".
+        Each summary describes historical_demand and forecast series by n, min, max, mean,
+        last value, trend_pct (percent of mean per day), weekly_seasonality (lag-7
+        autocorrelation) and sparkline (bucket means in time order).
+        
+        {lines}
+        
+        For every product, give one concise insight (at most 60 words) covering the demand
+        pattern, whether the forecast is realistic, and an inventory recommendation.
+        Respond only with a JSON object mapping each product_id to its insight string.
+        """
+        
+        content = await self._chat_completion(
+            [{"role": "user", "content": prompt}],
+            temperature=self.INSIGHTS_PARAMS["temperature"],
+            max_tokens=min(settings.ai_batch_tokens_per_product * len(batch), settings.ai_batch_max_completion_tokens),
+            response_format={"type": "json_object"},
+            priority=RateLimiter.BACKGROUND
+        )
+        return json.loads(content)
     
     async def get_inventory_optimization_insights(
         self, 
@@ -131,7 +665,12 @@ class AIService:
     
     def is_available(self) -> bool:
         """Check if AI service is available."""
-        return self.groq_client is not None
+        return self.http_client is not None
+    
+    async def close(self):
+        """Close pooled HTTP connections."""
+        if self.http_client:
+            await self.http_client.aclose()
 
 
 # Global AI service instance
@@ -0,0 +1,157 @@
+"""Nearest-neighbour product index for competitor selection."""
+import logging
+import os
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Attribute one-hots are weighted so that products from another category or
+# sold in another unit are only picked when nothing closer exists.
+CATEGORY_WEIGHT = 10.0
+UNIT_WEIGHT = 2.0
+
+
+class CompetitorIndex:
+    """Brute-force k-NN index over product attribute, price and sales features."""
+
+    FEATURES_FILE = "features.npy"
+    NORMS_FILE = "norms.npy"
+    IDS_FILE = "product_ids.npy"
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self.features: Optional[np.ndarray] = None
+        self.norms: Optional[np.ndarray] = None
+        self.product_ids: Optional[np.ndarray] = None
+        self.positions: Dict[str, int] = {}
+
+    @staticmethod
+    def build_features(products: List[Dict[str, Any]]) -> np.ndarray:
+        """Turn product rows into a standardized feature matrix."""
+        categories = sorted({str(p.get('category')) for p in products})
+        units = sorted({str(p.get('unit')) for p in products})
+
+        numeric = np.array([
+            (
+                np.log(max(float(p.get('price') or 0), 0.01)),
+                np.log1p(float(p.get('avg_quantity_sold') or 0)),
+                np.log1p(float(p.get('order_count') or 0)),
+                np.log1p(float(p.get('lead_time_days') or 0)),
+            )
+            for p in products
+        ], dtype=np.float64).reshape(len(products), 4)
+
+        std = numeric.std(axis=0)
+        std[std == 0] = 1.0
+        numeric = (numeric - numeric.mean(axis=0)) / std
+
+        category_onehot = np.zeros((len(products), len(categories)))
+        unit_onehot = np.zeros((len(products), len(units)))
+        category_pos = {c: i for i, c in enumerate(categories)}
+        unit_pos = {u: i for i, u in enumerate(units)}
+        for row, p in enumerate(products):
+            category_onehot[row, category_pos[str(p.get('category'))]] = CATEGORY_WEIGHT
+            unit_onehot[row, unit_pos[str(p.get('unit'))]] = UNIT_WEIGHT
+
+        return np.hstack([category_onehot, unit_onehot, numeric]).astype(np.float32)
+
+    def build(self, products: List[Dict[str, Any]]):
+        """Build the index in memory from product rows."""
+        self.features = self.build_features(products)
+        self.norms = np.einsum('ij,ij->i', self.features, self.features)
+        self.product_ids = np.array([str(p['id']) for p in products])
+        self.positions = {pid: i for i, pid in enumerate(self.product_ids)}
+
+    def save(self):
+        """Persist the index as plain .npy files that can be memory-mapped."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        np.save(os.path.join(self.index_dir, self.FEATURES_FILE), self.features)
+        np.save(os.path.join(self.index_dir, self.NORMS_FILE), self.norms)
+        np.save(os.path.join(self.index_dir, self.IDS_FILE), self.product_ids)
+        logger.info(f"Competitor index with {len(self.product_ids)} products saved to {self.index_dir}")
+
+    def load(self) -> bool:
+        """Memory-map a previously built index, if present."""
+        try:
+            self.features = np.load(os.path.join(self.index_dir, self.FEATURES_FILE), mmap_mode='r')
+            self.norms = np.load(os.path.join(self.index_dir, self.NORMS_FILE), mmap_mode='r')
+            self.product_ids = np.load(os.path.join(self.index_dir, self.IDS_FILE), mmap_mode='r')
+        except FileNotFoundError:
+            logger.info(f"No competitor index found in {self.index_dir}")
+            return False
+        except Exception as e:
+            logger.error(f"Failed to load competitor index: {e}")
+            return False
+
+        self.positions = {str(pid): i for i, pid in enumerate(self.product_ids)}
+        logger.info(f"Competitor index loaded with {len(self.positions)} products")
+        return True
+
+    def query(self, product_id: str, k: int) -> List[str]:
+        """Return the ids of the k products most comparable to product_id."""
+        position = self.positions.get(product_id)
+        if position is None:
+            return []
+
+        target = np.asarray(self.features[position])
+        # Squared euclidean distance via ||a||^2 + ||b||^2 - 2ab over the whole matrix
+        distances = self.norms + self.norms[position] - 2.0 * (self.features @ target)
+        distances[position] = np.inf
+
+        k = min(k, len(distances) - 1)
+        if k <= 0:
+            return []
+
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest])]
+        return [str(self.product_ids[i]) for i in nearest]
+
+    def is_loaded(self) -> bool:
+        """Check if the index holds any products."""
+        return bool(self.positions)
+
+
+def build_competitor_index():
+    """Build the competitor index offline from the products database."""
+    from sqlalchemy import text
+    from core.database import db_manager
+
+    with db_manager.get_session() as session:
+        result = session.execute(text("""
+            SELECT
+                p.id,
+                p.category,
+                p.unit,
+                p.price,
+                p.lead_time_days,
+                AVG(oi.quantity) as avg_quantity_sold,
+                COUNT(oi.id) as order_count
+            FROM products p
+            LEFT JOIN order_items oi ON p.id = oi.product_id
+            WHERE p.is_active = true
+            GROUP BY p.id, p.category, p.unit, p.price, p.lead_time_days
+        """))
+        products = [row._asdict() for row in result.fetchall()]
+
+    if not products:
+        logger.warning("No products found, competitor index not built")
+        return
+
+    index = CompetitorIndex(settings.competitor_index_dir)
+    index.build(products)
+    index.save()
+
+
+# Global competitor index instance
+competitor_index = CompetitorIndex(settings.competitor_index_dir)
+competitor_index.load()
+
+
+if __name__ == "__main__":
+    from core.logging_config import setup_logging
+    setup_logging()
+    build_competitor_index()
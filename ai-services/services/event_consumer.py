@@ -0,0 +1,212 @@
+"""Consume order and inventory events to invalidate caches and schedule retrains."""
+import asyncio
+import logging
+import os
+import socket
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import redis
+
+from config.settings import settings
+from core.job_queue import job_queue
+from core.redis_client import redis_manager
+from core.watermarks import DataWatermarks, data_watermarks
+from services.hot_insights import hot_request_key
+from services.product_categories import product_categories
+
+logger = logging.getLogger(__name__)
+
+ORDER_ITEMS_STREAM = "events:order_items"
+INVENTORY_STREAM = "events:inventory"
+RETRAIN_PENDING_KEY = "retrain:pending_products"
+
+
+class EventConsumer:
+    """Read order-item and inventory events from Redis Streams.
+
+    Producers XADD entries with a product_id field, and inventory events
+    also carry buyer_id. Every API worker joins the same consumer group,
+    so each event is handled once. Handling an event bumps the data
+    watermarks of the affected product, its category and the buyer. That
+    retires their forecast, price and inventory cache entries, including
+    price entries of other products in the same market. It also marks the
+    product for retraining. Marked products are retrained in batches through the
+    job queue.
+    """
+
+    def __init__(self):
+        self.consumer_name = f"{socket.gethostname()}-{os.getpid()}"
+        self.streams = [ORDER_ITEMS_STREAM, INVENTORY_STREAM]
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {
+            "events": 0,
+            "products_invalidated": 0,
+            "buyers_invalidated": 0,
+            "categories_invalidated": 0,
+            "retrains_scheduled": 0,
+        }
+
+    def start(self):
+        """Start consuming events."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+            logger.info(f"Event consumer {self.consumer_name} started")
+
+    async def stop(self):
+        """Stop consuming events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        next_retrain = loop.time() + settings.event_retrain_interval
+        groups_ready = False
+
+        while True:
+            try:
+                if not groups_ready:
+                    await self._ensure_groups()
+                    groups_ready = True
+
+                handled = await self.consume_once()
+                if loop.time() >= next_retrain:
+                    next_retrain = loop.time() + settings.event_retrain_interval
+                    await self.schedule_retrains()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event consumer error: {e}")
+                handled = 0
+
+            if not handled:
+                await asyncio.sleep(settings.event_poll_interval)
+
+    async def _ensure_groups(self):
+        for stream in self.streams:
+            try:
+                await redis_manager.execute(lambda: redis_manager.client.xgroup_create(
+                    stream, settings.event_consumer_group, id="$", mkstream=True
+                ))
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    async def consume_once(self) -> int:
+        """Handle one batch of new events plus events abandoned by dead consumers."""
+        entries = []
+        for stream in self.streams:
+            # Take over entries a crashed consumer read but never acknowledged
+            _, claimed, *_ = await redis_manager.execute(lambda: redis_manager.client.xautoclaim(
+                stream,
+                settings.event_consumer_group,
+                self.consumer_name,
+                min_idle_time=int(settings.event_claim_idle_time * 1000),
+                count=settings.event_batch_size
+            ))
+            entries.extend((stream, entry_id, fields) for entry_id, fields in claimed if fields)
+
+        response = await redis_manager.execute(lambda: redis_manager.client.xreadgroup(
+            settings.event_consumer_group,
+            self.consumer_name,
+            {stream: ">" for stream in self.streams},
+            count=settings.event_batch_size
+        ))
+        for stream, stream_entries in response or []:
+            entries.extend((stream.decode("utf-8"), entry_id, fields) for entry_id, fields in stream_entries)
+
+        if entries:
+            await self.handle_events(entries)
+        return len(entries)
+
+    async def handle_events(self, entries: List[Tuple[str, bytes, Dict[bytes, bytes]]]):
+        """Bump watermarks for the products and buyers touched by a batch, then acknowledge it."""
+        products: Set[str] = set()
+        buyers: Set[str] = set()
+        acks: Dict[str, List[bytes]] = {}
+
+        for stream, entry_id, fields in entries:
+            fields = {key.decode("utf-8"): value.decode("utf-8") for key, value in fields.items()}
+            if fields.get("product_id"):
+                products.add(fields["product_id"])
+            if stream == INVENTORY_STREAM and fields.get("buyer_id"):
+                buyers.add(fields["buyer_id"])
+            acks.setdefault(stream, []).append(entry_id)
+
+        if not await data_watermarks.bump(DataWatermarks.PRODUCTS, products):
+            raise redis.RedisError("Failed to update product watermarks")
+        if not await data_watermarks.bump(DataWatermarks.BUYERS, buyers):
+            raise redis.RedisError("Failed to update buyer watermarks")
+        # Database errors propagate, leaving the batch unacknowledged for a retry
+        categories = await self._categories_of(products)
+        if not await data_watermarks.bump(DataWatermarks.CATEGORIES, categories):
+            raise redis.RedisError("Failed to update category watermarks")
+
+        async with redis_manager.pipeline(transaction=False) as pipe:
+            if products:
+                pipe.sadd(RETRAIN_PENDING_KEY, *products)
+            for stream, entry_ids in acks.items():
+                pipe.xack(stream, settings.event_consumer_group, *entry_ids)
+
+        self.stats["events"] += len(entries)
+        self.stats["products_invalidated"] += len(products)
+        self.stats["buyers_invalidated"] += len(buyers)
+        self.stats["categories_invalidated"] += len(categories)
+        logger.debug(f"Handled {len(entries)} events touching {len(products)} products and {len(buyers)} buyers")
+
+    @staticmethod
+    async def _categories_of(products: Set[str]) -> Set[str]:
+        """Look up the categories of the products touched by a batch."""
+        if not products:
+            return set()
+        categories = await product_categories.get_many(products)
+        return {category for category in categories.values() if category}
+
+    async def schedule_retrains(self) -> int:
+        """Queue forecast jobs for a batch of products whose data changed."""
+        if not settings.event_retrain_enabled:
+            return 0
+
+        members = await redis_manager.execute(lambda: redis_manager.client.spop(
+            RETRAIN_PENDING_KEY, settings.event_retrain_batch_size
+        ))
+        product_ids = [member.decode("utf-8") for member in members or []]
+        if not product_ids:
+            return 0
+
+        params = await redis_manager.get_many([hot_request_key(pid) for pid in product_ids])
+        for product_id in product_ids:
+            await job_queue.enqueue("demand_forecast", self._forecast_payload(
+                product_id,
+                params.get(hot_request_key(product_id))
+            ))
+
+        self.stats["retrains_scheduled"] += len(product_ids)
+        logger.info(f"Scheduled retraining for {len(product_ids)} products with new data")
+        return len(product_ids)
+
+    @staticmethod
+    def _forecast_payload(product_id: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reuse the parameters products are usually requested with, else a default window."""
+        if params:
+            return {"product_id": product_id, **params}
+        today = date.today()
+        return {
+            "product_id": product_id,
+            "start_date": (today - timedelta(days=settings.event_retrain_history_days)).isoformat(),
+            "end_date": today.isoformat(),
+            "forecast_days": 30,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get event and retrain counters for this worker."""
+        return {**self.stats, "running": self._task is not None}
+
+
+# Global event consumer instance
+event_consumer = EventConsumer()
@@ -0,0 +1,113 @@
+"""Background precomputation of insights for frequently requested products."""
+import asyncio
+import logging
+from typing import Callable, Dict, Any, Optional, Tuple
+
+from config.settings import settings
+from core.redis_client import redis_manager
+from services.ai_service import ai_service
+
+logger = logging.getLogger(__name__)
+
+# Bookkeeping lives outside the ai_insights cache namespace, so clearing
+# cached insights keeps the ranking and request parameters
+HOT_PRODUCTS_KEY = "hot_insights:products"
+REFRESH_LOCK_KEY = "hot_insights:refresh:lock"
+
+
+def hot_request_key(product_id: str) -> str:
+    """Key of the parameters a product's forecasts are usually requested with."""
+    return f"hot_insights:request:{product_id}"
+
+
+ForecastLoader = Callable[[str, Dict[str, Any]], Optional[Tuple[list, list]]]
+
+
+class HotInsightsRefresher:
+    """Track per-product request frequency and refresh the hottest insights before they expire.
+
+    Request counts live in a Redis sorted set shared by all workers and decay
+    by a constant factor every cycle, so the ranking follows recent demand.
+    """
+
+    def __init__(self):
+        self.loader: Optional[ForecastLoader] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"cycles": 0, "products_covered": 0}
+
+    async def record_request(self, product_id: str, params: Dict[str, Any]):
+        """Count a forecast request and remember its parameters for refreshes."""
+        await redis_manager.zincrby(HOT_PRODUCTS_KEY, product_id)
+        await redis_manager.set(
+            hot_request_key(product_id),
+            params,
+            ttl=settings.ai_model_cache_ttl * 24
+        )
+
+    def start(self, loader: ForecastLoader):
+        """Start the periodic refresh loop."""
+        self.loader = loader
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+            logger.info("Hot product insights refresher started")
+
+    async def stop(self):
+        """Stop the periodic refresh loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.hot_insights_refresh_interval)
+            try:
+                await self.refresh_once()
+            except Exception as e:
+                logger.error(f"Hot product insights refresh failed: {e}", exc_info=True)
+
+    async def refresh_once(self) -> int:
+        """Regenerate insights for the hottest products whose cache entries expire soon."""
+        # Only one worker refreshes per cycle; the lock is left to expire so
+        # cycles stay one interval apart across the fleet
+        if await redis_manager.acquire_lock(REFRESH_LOCK_KEY, settings.hot_insights_refresh_interval) is None:
+            return 0
+
+        product_ids = await redis_manager.zrevrange(HOT_PRODUCTS_KEY, settings.hot_insights_top_n)
+        await redis_manager.zdecay(HOT_PRODUCTS_KEY, settings.hot_insights_decay, min_score=0.5)
+
+        items = []
+        for product_id in product_ids:
+            params = await redis_manager.get(hot_request_key(product_id))
+            if not params:
+                continue
+            # Database access and model training stay off the event loop
+            forecast = await asyncio.to_thread(self.loader, product_id, params)
+            if forecast is None:
+                continue
+            historical_data, predictions = forecast
+            items.append({
+                "product_id": product_id,
+                "historical_data": historical_data,
+                "predictions": predictions
+            })
+
+        if not items:
+            return 0
+
+        # Anything expiring before the next cycle, plus one cycle of slack, is regenerated now
+        results = await ai_service.get_batch_demand_forecast_insights(
+            items,
+            refresh_within=settings.hot_insights_refresh_interval * 2
+        )
+        self.stats["cycles"] += 1
+        self.stats["products_covered"] += len(results)
+        logger.info(f"Hot product insights covered {len(results)} of {len(product_ids)} products")
+        return len(results)
+
+
+# Global hot insights refresher instance
+hot_insights_refresher = HotInsightsRefresher()
@@ -0,0 +1,70 @@
+"""Template-based insights used when the LLM cannot be reached."""
+from typing import Dict, Any, List, Optional
+
+from services.prompt_compaction import summarize_context
+
+FALLBACK_HEADER = "Automated summary (AI analysis is temporarily unavailable):"
+
+
+def _is_series_summary(value: Any) -> bool:
+    return isinstance(value, dict) and "mean" in value and "n" in value
+
+
+def _describe_series(name: str, summary: Dict[str, Any]) -> str:
+    """Describe one series summary in a sentence."""
+    text = (
+        f"{name.replace('_', ' ').capitalize()} averages {summary['mean']} "
+        f"(range {summary['min']}-{summary['max']}, latest {summary['last']})"
+    )
+    trend = summary.get("trend_pct")
+    if trend is not None:
+        if trend > 1:
+            text += f", trending up {trend}% per period"
+        elif trend < -1:
+            text += f", trending down {abs(trend)}% per period"
+        else:
+            text += ", broadly flat"
+    if summary.get("weekly_seasonality", 0) >= 0.5:
+        text += ", with a clear weekly pattern"
+    return text + "."
+
+
+def _demand_recommendations(history: Dict[str, Any], forecast: Dict[str, Any]) -> List[str]:
+    """Derive inventory recommendations from historical and forecast summaries."""
+    recommendations = []
+    if not history.get("mean"):
+        return ["Collect more sales history before relying on the forecast."]
+
+    change = (forecast["mean"] - history["mean"]) / history["mean"] * 100
+    recommendations.append(f"Forecast demand is {abs(change):.0f}% {'above' if change >= 0 else 'below'} the historical average.")
+
+    if change > 10:
+        recommendations.append("Increase stock levels ahead of the expected rise in demand.")
+    elif change < -10:
+        recommendations.append("Reduce upcoming orders to avoid overstock and waste.")
+    else:
+        recommendations.append("Maintain current replenishment levels.")
+
+    if forecast["max"] > history["max"]:
+        recommendations.append("The forecast exceeds the historical peak; review it before committing to large orders.")
+    if history.get("n", 0) < 14:
+        recommendations.append("Limited history: treat the forecast as low confidence.")
+    return recommendations
+
+
+def generate_fallback_insights(context: Optional[Dict[str, Any]]) -> str:
+    """Build deterministic insights from the numeric statistics in the context."""
+    summary = summarize_context(context, buckets=0) if isinstance(context, dict) else {}
+    series = {name: value for name, value in summary.items() if _is_series_summary(value)}
+
+    lines = [FALLBACK_HEADER]
+    lines.extend(f"- {_describe_series(name, value)}" for name, value in series.items() if value["n"])
+
+    history = series.get("historical_demand")
+    forecast = series.get("forecast")
+    if history and forecast and history["n"] and forecast["n"]:
+        lines.extend(f"- {text}" for text in _demand_recommendations(history, forecast))
+
+    if len(lines) == 1:
+        lines.append("- No numeric data was available for an automated summary. Please retry shortly.")
+    return "\n".join(lines)
@@ -0,0 +1,245 @@
+"""Worker processes running heavy ML jobs from the Redis job queue.
+
+Run with ``python -m services.job_worker [--processes N]``.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import pandas as pd
+
+from config.settings import settings
+from core.database import db_manager
+from core.job_queue import JobQueue, job_queue
+from core.queries import DEMAND_HISTORY_QUERY, INVENTORY_QUERY
+from core.rate_limiter import RateLimiter
+from core.near_cache import near_cache
+from core.redis_client import redis_manager
+from core.watermarks import DataWatermarks, data_watermarks
+from models import (
+    BusinessInsightsRequest,
+    DemandForecastRequest,
+    DemandForecastResponse,
+    InventoryOptimizationRequest,
+    InventoryOptimizationResponse,
+)
+from services.ai_service import ai_service
+from services.ml_service import ml_service, forecast_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def _fetch_rows(query, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    with db_manager.get_session() as session:
+        return [row._asdict() for row in session.execute(query, params).fetchall()]
+
+
+async def run_demand_forecast(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Forecast demand for a product, with insights generated at background priority.
+
+    The forecast is cached for the product's current data version, so
+    retrains scheduled after new orders also warm the API's cache.
+    """
+    request = DemandForecastRequest(**payload)
+    version = await data_watermarks.get(DataWatermarks.PRODUCTS, request.product_id)
+    rows = await asyncio.to_thread(_fetch_rows, DEMAND_HISTORY_QUERY, {
+        "start_date": request.start_date,
+        "end_date": request.end_date,
+        "product_id": request.product_id
+    })
+
+    if not rows:
+        return DemandForecastResponse(
+            product_id=request.product_id,
+            forecast_period=request.forecast_days,
+            predictions=ml_service._generate_default_predictions(request.forecast_days),
+            confidence_score=0.5,
+            model_used="default"
+        ).model_dump(mode="json")
+
+    df = pd.DataFrame(rows)
+    predictions, confidence_score, model_used = await ml_service.predict_demand(df, request.forecast_days)
+    await near_cache.set(
+        forecast_cache_key(request.product_id, version, request.start_date, request.end_date, request.forecast_days),
+        {
+            "predictions": predictions,
+            "confidence_score": confidence_score,
+            "model_used": model_used,
+            "historical_demand": df['quantity'].tolist()
+        },
+        ttl=settings.forecast_cache_ttl
+    )
+
+    prompt, context = ai_service.build_demand_forecast_request(df['quantity'].tolist(), predictions)
+    insights = await ai_service.get_business_insights(prompt, context, RateLimiter.BACKGROUND)
+
+    return DemandForecastResponse(
+        product_id=request.product_id,
+        forecast_period=request.forecast_days,
+        predictions=predictions,
+        confidence_score=confidence_score,
+        model_used=model_used,
+        ai_insights=insights,
+        insights_status="ready"
+    ).model_dump(mode="json")
+
+
+async def run_inventory_optimization(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Optimize a buyer's inventory levels."""
+    request = InventoryOptimizationRequest(**payload)
+    inventory_data = await asyncio.to_thread(_fetch_rows, INVENTORY_QUERY, {"buyer_id": request.buyer_id})
+
+    if not inventory_data:
+        return InventoryOptimizationResponse(
+            buyer_id=request.buyer_id,
+            recommendations=[],
+            total_cost_savings=0,
+            optimization_score=0
+        ).model_dump(mode="json")
+
+    optimization_result = ml_service.optimize_inventory(inventory_data)
+    return InventoryOptimizationResponse(
+        buyer_id=request.buyer_id,
+        recommendations=optimization_result['recommendations'],
+        total_cost_savings=optimization_result['total_cost_savings'],
+        optimization_score=optimization_result['optimization_score']
+    ).model_dump(mode="json")
+
+
+async def run_insights(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate free-form business insights."""
+    request = BusinessInsightsRequest(**payload)
+    insights = await ai_service.get_business_insights(request.prompt, request.context, RateLimiter.BACKGROUND)
+    return {"insights": insights}
+
+
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]] = {
+    "demand_forecast": run_demand_forecast,
+    "inventory_optimization": run_inventory_optimization,
+    "insights": run_insights,
+}
+
+
+class JobWorker:
+    """Claims jobs one at a time and records their outcome."""
+
+    def __init__(self, queue: JobQueue):
+        self.queue = queue
+        self._stopping = False
+
+    def stop(self):
+        """Finish the current job and exit."""
+        self._stopping = True
+
+    async def run(self):
+        logger.info(f"Job worker started on queue {self.queue.name}")
+        while not self._stopping:
+            try:
+                job_id = await self.queue.claim()
+            except Exception as e:
+                logger.error(f"Failed to claim job: {e}")
+                job_id = None
+
+            if job_id is None:
+                await asyncio.sleep(settings.job_poll_interval)
+                continue
+
+            try:
+                await self.process(job_id)
+            except Exception as e:
+                # Left claimed, so the visibility timeout requeues it
+                logger.error(f"Failed to record outcome of job {job_id}: {e}", exc_info=True)
+
+        logger.info("Job worker stopped")
+
+    async def process(self, job_id: str):
+        """Run one claimed job, acknowledging it or scheduling a retry."""
+        job = await self.queue.get_job(job_id)
+        if job is None:
+            logger.warning(f"Job {job_id} record expired, dropping it")
+            await self.queue.ack(job_id)
+            return
+
+        job["attempts"] += 1
+        if job["attempts"] > job["max_attempts"]:
+            # The last attempt's worker died or overran the visibility timeout
+            await self._finish(job, JobQueue.FAILED, error=job["error"] or "Visibility timeout exceeded")
+            return
+
+        handler = JOB_HANDLERS.get(job["job_type"])
+        if handler is None:
+            await self._finish(job, JobQueue.FAILED, error=f"Unknown job type {job['job_type']}")
+            return
+
+        job["status"] = JobQueue.RUNNING
+        job["started_at"] = datetime.now().isoformat()
+        await self.queue.save_job(job)
+
+        try:
+            result = await handler(job["payload"])
+        except Exception as e:
+            logger.error(f"Job {job_id} attempt {job['attempts']} failed: {e}", exc_info=True)
+            if job["attempts"] >= job["max_attempts"]:
+                await self._finish(job, JobQueue.FAILED, error=str(e))
+                return
+            job["status"] = JobQueue.RETRYING
+            job["error"] = str(e)
+            await self.queue.save_job(job)
+            await self.queue.retry_later(job_id, settings.job_retry_backoff * 2 ** (job["attempts"] - 1))
+            return
+
+        await self._finish(job, JobQueue.COMPLETED, result=result)
+        logger.info(f"Job {job_id} ({job['job_type']}) completed")
+
+    async def _finish(self, job: Dict[str, Any], status: str, result: Any = None, error: str = None):
+        job["status"] = status
+        job["result"] = result
+        job["error"] = error
+        job["finished_at"] = datetime.now().isoformat()
+        await self.queue.save_job(job)
+        await self.queue.ack(job["job_id"])
+
+
+async def _run_worker():
+    worker = JobWorker(job_queue)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    redis_manager.start_health_probe()
+    try:
+        await worker.run()
+    finally:
+        await redis_manager.stop_health_probe()
+        await ai_service.close()
+        await redis_manager.close()
+
+
+def run_worker_process():
+    """Entry point of one worker process."""
+    from core.logging_config import setup_logging
+    setup_logging()
+    asyncio.run(_run_worker())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run ML job workers")
+    parser.add_argument("--processes", type=int, default=settings.job_worker_processes)
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_worker_process()
+    else:
+        # Spawn so every process opens its own Redis, database and HTTP connections
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=run_worker_process) for _ in range(args.processes)]
+        for process in processes:
+            process.start()
+        # Forward termination so each worker finishes its current job
+        signal.signal(signal.SIGTERM, lambda *_: [process.terminate() for process in processes])
+        for process in processes:
+            process.join()
@@ -2,7 +2,7 @@
 import logging
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
@@ -12,10 +12,16 @@ import os
 
 from config.settings import settings
 from core.redis_client import redis_manager
+from core.watermarks import data_watermarks
 
 logger = logging.getLogger(__name__)
 
 
+def forecast_cache_key(product_id: str, version: int, start_date: Any, end_date: Any, forecast_days: int) -> str:
+    """Cache key of a demand forecast computed from a given product data version."""
+    return data_watermarks.cache_key("forecast", product_id, version, start_date, end_date, forecast_days)
+
+
 class MLService:
     """Machine Learning service for demand forecasting and optimization."""
     
@@ -296,6 +302,92 @@ class MLService:
                 "recommendations": []
             }
 
+    
+    def simulate_price_grid(
+        self,
+        market_data: List[Dict[str, Any]],
+        current_price: float,
+        current_volume: float,
+        min_price: float,
+        max_price: float,
+        grid_points: int,
+        unit_cost: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Project volume, revenue and profit over a grid of candidate prices.
+        
+        Demand is linear in price, calibrated to the fitted elasticity at the
+        reference price. Unlike constant-elasticity demand, where revenue is
+        monotonic in price and the optimum always lands on a grid endpoint,
+        this has an interior revenue and profit optimum.
+        """
+        elasticity, intercept, demand_model = self._fit_price_elasticity(market_data)
+        
+        reference_price = current_price
+        if reference_price <= 0:
+            market_prices = [float(item['price']) for item in market_data if item.get('price')]
+            reference_price = float(np.mean(market_prices)) if market_prices else max(max_price, 1.0)
+        
+        # Anchor the demand curve on the product's own sales when available
+        if current_volume and current_volume > 0:
+            base_volume = current_volume
+        elif intercept is not None:
+            base_volume = float(np.exp(intercept + elasticity * np.log(reference_price)))
+        else:
+            quantities = [float(item['avg_quantity_sold']) for item in market_data if item.get('avg_quantity_sold')]
+            base_volume = float(np.mean(quantities)) if quantities else 1.0
+        
+        # Linear demand evaluated over the whole grid at once, with no negative volumes
+        prices = np.linspace(min_price, max_price, grid_points)
+        volumes = base_volume * np.maximum(1.0 + elasticity * (prices / reference_price - 1.0), 0.0)
+        revenues = prices * volumes
+        profits = (prices - unit_cost) * volumes if unit_cost is not None else None
+        
+        objective = profits if profits is not None else revenues
+        best = int(np.argmax(objective))
+        
+        # Columns rather than per-point records keep serialization off the hot path
+        curve = {
+            "prices": prices.round(4).tolist(),
+            "projected_volume": volumes.round(4).tolist(),
+            "projected_revenue": revenues.round(4).tolist(),
+            "projected_profit": profits.round(4).tolist() if profits is not None else None
+        }
+        
+        return {
+            "current_price": current_price,
+            "price_elasticity": elasticity,
+            "demand_model": demand_model,
+            "curve": curve,
+            "optimal_price": float(prices[best]),
+            "optimal_volume": float(volumes[best]),
+            "optimal_revenue": float(revenues[best]),
+            "optimal_profit": float(profits[best]) if profits is not None else None
+        }
+    
+    def _fit_price_elasticity(self, market_data: List[Dict[str, Any]]) -> Tuple[float, Optional[float], str]:
+        """Estimate price elasticity with a log-log fit on category prices and sold quantities.
+        
+        Returns the elasticity, the log-log intercept that goes with it, or
+        None without enough data for a fit, and the demand model used.
+        """
+        points = np.array([
+            (float(item['price']), float(item['avg_quantity_sold']))
+            for item in market_data
+            if item.get('price') and item.get('avg_quantity_sold')
+        ])
+        
+        if len(points) < 3 or np.ptp(points[:, 0]) == 0:
+            return settings.default_price_elasticity, None, "linear_demand_default_elasticity"
+        
+        log_prices, log_quantities = np.log(points[:, 0]), np.log(points[:, 1])
+        slope = np.polyfit(log_prices, log_quantities, 1)[0]
+        
+        # Upward-sloping or extreme fits are noise in small categories
+        elasticity = float(np.clip(slope, -5.0, -0.1))
+        # Refit the intercept for the clipped slope, so the two describe the same curve
+        intercept = float(np.mean(log_quantities - elasticity * log_prices))
+        return elasticity, intercept, "linear_demand_category_elasticity"
+
 
 # Global ML service instance
 ml_service = MLService()
@@ -0,0 +1,48 @@
+"""Cached product to category mapping."""
+import logging
+from typing import Dict, Iterable, Optional
+
+from config.settings import settings
+from core.database import db_manager
+from core.lru_cache import TTLCache
+from core.queries import PRODUCT_CATEGORIES_QUERY
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class ProductCategories:
+    """Look up product categories through a bounded in-process cache.
+
+    Products are rarely recategorized, so each worker keeps recent lookups,
+    including products without a category, and picks up a change once the
+    entry expires.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize, ttl)
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def get_many(self, product_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Get the category of each product, None when it has none or does not exist."""
+        categories = {product_id: self._cache.get(product_id, _MISSING) for product_id in product_ids}
+        missing = [product_id for product_id, category in categories.items() if category is _MISSING]
+        self.stats["hits"] += len(categories) - len(missing)
+        self.stats["misses"] += len(missing)
+
+        if missing:
+            rows = await db_manager.fetch_all(PRODUCT_CATEGORIES_QUERY, {"product_ids": missing})
+            found = {row["id"]: row["category"] for row in rows}
+            for product_id in missing:
+                categories[product_id] = found.get(product_id)
+                self._cache.set(product_id, categories[product_id])
+        return categories
+
+    async def get(self, product_id: str) -> Optional[str]:
+        """Get the category of one product."""
+        return (await self.get_many([product_id]))[product_id]
+
+
+# Global product categories instance
+product_categories = ProductCategories(settings.product_category_cache_size, settings.product_category_cache_ttl)
@@ -0,0 +1,175 @@
+"""Compact prompt contexts into token-efficient numeric summaries."""
+import json
+import logging
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numeric lists at most this long are kept verbatim
+MAX_RAW_SERIES_LENGTH = 8
+
+# Fields that mark a list of records as a time series, such as daily demand
+TIME_FIELDS = {"date", "day", "week", "month", "period", "timestamp", "created_at", "ds"}
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of text with a local word-piece heuristic."""
+    return sum(max(1, math.ceil(len(piece) / 4)) for piece in _TOKEN_PATTERN.findall(text))
+
+
+def dumps_compact(value: Any) -> str:
+    """Serialize a value as JSON without insignificant whitespace."""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+def summarize_series(values: List[float], buckets: int = 8) -> Dict[str, Any]:
+    """Summarize a numeric series by range, trend, weekly seasonality and a sparkline."""
+    series = np.asarray(values, dtype=float)
+    if series.size == 0:
+        return {"n": 0}
+
+    mean = float(series.mean())
+    summary = {
+        "n": int(series.size),
+        "min": round(float(series.min()), 2),
+        "max": round(float(series.max()), 2),
+        "mean": round(mean, 2),
+        "last": round(float(series[-1]), 2),
+    }
+
+    if series.size >= 2:
+        slope = np.polyfit(np.arange(series.size), series, 1)[0]
+        # Trend as percent of the mean per step, comparable across products
+        summary["trend_pct"] = round(float(slope / mean * 100), 2) if mean else 0.0
+
+    if series.size >= 14 and series.std() > 0:
+        weekly = np.corrcoef(series[:-7], series[7:])[0, 1]
+        summary["weekly_seasonality"] = round(float(weekly), 2)
+
+    if buckets and series.size > buckets:
+        summary["sparkline"] = [round(float(chunk.mean()), 1) for chunk in np.array_split(series, buckets)]
+
+    return summary
+
+
+def _time_field(records: List[Dict[str, Any]]) -> Optional[str]:
+    """Get the field every record is timestamped by, if any."""
+    for key in records[0]:
+        if key in TIME_FIELDS and all(record.get(key) is not None for record in records):
+            return key
+    return None
+
+
+def _numeric_series(value: Any) -> Optional[Dict[str, Any]]:
+    """Extract numeric columns from a list of numbers or a time series of flat dicts.
+
+    Other lists of dicts, such as product records, are not series: their
+    rows are unrelated and their identifying fields must be kept.
+    """
+    if not isinstance(value, list) or len(value) <= MAX_RAW_SERIES_LENGTH:
+        return None
+
+    if all(isinstance(item, (int, float)) and not isinstance(item, bool) for item in value):
+        return {"": [float(item) for item in value]}
+
+    if all(isinstance(item, dict) for item in value):
+        time_field = _time_field(value)
+        if time_field is None:
+            return None
+        columns = {time_field: {"from": value[0][time_field], "to": value[-1][time_field]}}
+        for key in value[0]:
+            column = [item.get(key) for item in value]
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in column):
+                columns[key] = [float(v) for v in column]
+        return columns
+
+    return None
+
+
+def _compact(value: Any, buckets: int) -> Any:
+    """Recursively replace long numeric series with summaries."""
+    if isinstance(value, dict):
+        return {key: _compact(item, buckets) for key, item in value.items()}
+
+    columns = _numeric_series(value)
+    if columns is not None:
+        if list(columns) == [""]:
+            return summarize_series(columns[""], buckets)
+        return {
+            key: summarize_series(column, buckets) if isinstance(column, list) else column
+            for key, column in columns.items()
+        }
+
+    if isinstance(value, list):
+        return [_compact(item, buckets) for item in value]
+
+    if isinstance(value, float):
+        return round(value, 4)
+
+    return value
+
+
+def summarize_context(context: Dict[str, Any], buckets: int = 8) -> Dict[str, Any]:
+    """Return the context with long numeric series replaced by summaries."""
+    return _compact(context, buckets)
+
+
+def _shrink(container: Any) -> bool:
+    """Shrink the largest part of a compacted context in place.
+
+    Descends into the biggest field, then halves it if it is a list or a
+    long string and drops it otherwise. Returns False once nothing is left.
+    """
+    while True:
+        keys = list(container) if isinstance(container, dict) else list(range(len(container)))
+        if not keys:
+            return False
+        key = max(keys, key=lambda k: len(dumps_compact(container[k])))
+        item = container[key]
+
+        if isinstance(item, dict) and item or isinstance(item, list) and len(item) == 1:
+            container = item
+            continue
+        if isinstance(item, list) and len(item) > 1:
+            container[key] = item[:len(item) // 2]
+        elif isinstance(item, str) and len(item) > 32:
+            container[key] = item[:len(item) // 2] + "..."
+        else:
+            del container[key]
+        return True
+
+
+def compact_context(context: Optional[Dict[str, Any]], token_budget: int, buckets: int = 8) -> str:
+    """Serialize context compactly within the token budget.
+
+    Sparklines are shrunk first. If that is not enough, the largest fields
+    are truncated or dropped until the context fits, and it is marked as
+    truncated.
+    """
+    if not context:
+        return "No additional context"
+
+    compacted = _compact(context, buckets)
+    text = dumps_compact(compacted)
+    while estimate_tokens(text) > token_budget and buckets > 0:
+        buckets //= 2
+        compacted = _compact(context, buckets)
+        text = dumps_compact(compacted)
+
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    original_tokens = estimate_tokens(text)
+    while estimate_tokens(text) > token_budget and _shrink(compacted):
+        text = dumps_compact({**compacted, "truncated": True})
+    logger.warning(f"Prompt context of ~{original_tokens} tokens truncated to fit budget of {token_budget}")
+
+    if estimate_tokens(text) > token_budget:
+        return "No additional context"
+    return text
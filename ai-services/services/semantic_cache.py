@@ -0,0 +1,134 @@
+"""Near-duplicate prompt cache using hashed TF-IDF vectors."""
+import hashlib
+import json
+import logging
+import re
+import zlib
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from",
+    "how", "i", "in", "is", "it", "me", "my", "of", "on", "or", "our", "please",
+    "should", "the", "this", "to", "us", "we", "what", "which", "with", "you",
+})
+
+
+class SemanticCache:
+    """Bounded LRU cache that matches prompts by cosine similarity.
+
+    Prompts are embedded on-box by hashing content words into a fixed
+    number of buckets. Raw term frequencies are stored in a NumPy matrix and
+    IDF weights are applied at query time, so weights stay current as the
+    cache fills without re-embedding stored prompts. Only entries with the
+    same context digest are candidates for a match.
+    """
+
+    def __init__(self, capacity: int, dimensions: int, threshold: float):
+        self.capacity = capacity
+        self.dimensions = dimensions
+        self.threshold = threshold
+        self.vectors = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.squared = np.zeros((capacity, dimensions), dtype=np.float32)
+        self.document_frequency = np.zeros(dimensions, dtype=np.float32)
+        self.context_digests = np.zeros(capacity, dtype=np.int64)
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.answers: List[Optional[str]] = [None] * capacity
+        self.size = 0
+        self._clock = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def context_digest(model: str, context: Any) -> int:
+        """Reduce the model name and canonical context to a 63-bit digest."""
+        material = json.dumps([model, context], sort_keys=True, separators=(",", ":"), default=str)
+        return int.from_bytes(hashlib.sha256(material.encode("utf-8")).digest()[:8], "big") >> 1
+
+    def _vectorize(self, prompt: str) -> np.ndarray:
+        """Embed a prompt as sublinear hashed term frequencies."""
+        words = [w for w in _WORD_PATTERN.findall(prompt.lower()) if w not in STOP_WORDS]
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if not words:
+            return vector
+
+        indices = [zlib.crc32(word.encode("utf-8")) % self.dimensions for word in words]
+        counts = np.bincount(indices, minlength=self.dimensions).astype(np.float32)
+        nonzero = counts > 0
+        vector[nonzero] = 1.0 + np.log(counts[nonzero])
+        return vector
+
+    def _idf_squared(self) -> np.ndarray:
+        """Smoothed squared IDF weights over the cached prompts."""
+        idf = np.log((1.0 + self.size) / (1.0 + self.document_frequency)) + 1.0
+        return idf * idf
+
+    def lookup(self, prompt: str, context_digest: int) -> Optional[str]:
+        """Return the cached answer for the most similar prompt above the threshold."""
+        if self.size == 0:
+            self.stats["misses"] += 1
+            return None
+
+        query = self._vectorize(prompt)
+        weights = self._idf_squared()
+        rows = slice(0, self.size)
+
+        dot = self.vectors[rows] @ (query * weights)
+        norms = np.sqrt(self.squared[rows] @ weights) * np.sqrt(np.dot(query * query, weights))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            similarity = np.where(norms > 0, dot / norms, 0.0)
+        similarity[self.context_digests[rows] != context_digest] = -1.0
+
+        best = int(np.argmax(similarity))
+        if similarity[best] < self.threshold:
+            self.stats["misses"] += 1
+            return None
+
+        self._clock += 1
+        self.last_used[best] = self._clock
+        self.stats["hits"] += 1
+        logger.debug(f"Semantic cache hit with similarity {similarity[best]:.3f}")
+        return self.answers[best]
+
+    def store(self, prompt: str, context_digest: int, answer: str):
+        """Add a prompt and its answer, evicting the least recently used entry when full."""
+        vector = self._vectorize(prompt)
+
+        if self.size < self.capacity:
+            row = self.size
+            self.size += 1
+        else:
+            row = int(np.argmin(self.last_used))
+            self.document_frequency -= self.vectors[row] > 0
+            self.stats["evictions"] += 1
+
+        self.vectors[row] = vector
+        self.squared[row] = vector * vector
+        self.document_frequency += vector > 0
+        self.context_digests[row] = context_digest
+        self.answers[row] = answer
+        self._clock += 1
+        self.last_used[row] = self._clock
+
+    def clear(self):
+        """Drop all cached prompts."""
+        self.vectors[:] = 0
+        self.squared[:] = 0
+        self.document_frequency[:] = 0
+        self.last_used[:] = 0
+        self.answers = [None] * self.capacity
+        self.size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss counters."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": self.size,
+            "capacity": self.capacity,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0
+        }
@@ -0,0 +1,35 @@
+"""Shared fixtures for the AI services tests."""
+import time
+
+import pytest
+
+from core.redis_client import redis_manager
+
+from tests.redis_helpers import use_fake_redis
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """The global RedisManager, backed by an in-memory Redis server."""
+    return use_fake_redis(redis_manager, monkeypatch)
+
+
+class Clock:
+    """A manually advanced stand-in for time.monotonic."""
+
+    def __init__(self, now: float):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """Replace time.monotonic with a manual clock, starting at 1000.0 unless parametrized.
+
+    The event loop reads the same clock, so only use it in synchronous tests.
+    """
+    clock = Clock(getattr(request, "param", 1000.0))
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
@@ -0,0 +1,25 @@
+"""Helpers backing RedisManager nodes with in-memory Redis servers."""
+import fakeredis
+import pytest
+
+from core.circuit_breaker import CircuitBreaker
+from core.redis_client import RELEASE_LOCK_SCRIPT, RedisManager, RedisNode
+
+
+def use_fake_node(node: RedisNode, monkeypatch: pytest.MonkeyPatch) -> RedisNode:
+    """Back a Redis node with its own in-memory Redis server."""
+    monkeypatch.setattr(node, "client", fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer()))
+    monkeypatch.setattr(node, "circuit_breaker", CircuitBreaker(f"redis {node.name}", 5, 30.0))
+    return node
+
+
+def use_fake_redis(manager: RedisManager, monkeypatch: pytest.MonkeyPatch) -> RedisManager:
+    """Back every node of a RedisManager with its own in-memory Redis server."""
+    for node in manager.nodes.values():
+        use_fake_node(node, monkeypatch)
+    monkeypatch.setattr(manager, "client", manager.primary.client)
+    monkeypatch.setattr(manager, "circuit_breaker", manager.primary.circuit_breaker)
+    monkeypatch.setattr(manager, "_release_lock_script", manager.client.register_script(RELEASE_LOCK_SCRIPT))
+    monkeypatch.setattr(manager, "refresh_stats", dict.fromkeys(manager.refresh_stats, 0))
+    manager.fallback_cache.clear()
+    return manager
@@ -0,0 +1,103 @@
+"""Tests for circuit breaker state changes."""
+import pytest
+
+from core.circuit_breaker import CircuitBreaker
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, reset_timeout=10.0)
+
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+
+
+def test_opens_after_consecutive_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+    assert breaker.get_status()["rejected_calls"] == 1
+
+
+def test_success_resets_the_failure_count(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_allows_a_single_trial_after_reset_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 10.0
+    assert not breaker.is_open()
+
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.is_open()
+    assert not breaker.allow_request()
+
+
+def test_successful_trial_closes_the_circuit(breaker, clock):
+    trip(breaker)
+    clock.now += 10.0
+    breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.get_status()["consecutive_failures"] == 0
+    assert breaker.allow_request()
+
+
+def test_failed_trial_reopens_the_circuit(breaker, clock):
+    trip(breaker)
+    clock.now += 10.0
+    breaker.allow_request()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+    clock.now += 10.0
+    assert breaker.allow_request()
+
+
+def test_unresolved_trial_is_replaced_after_reset_timeout(breaker, clock):
+    trip(breaker)
+    clock.now += 10.0
+    assert breaker.allow_request()
+
+    clock.now += 9.0
+    assert not breaker.allow_request()
+    clock.now += 1.0
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_released_trial_lets_the_next_call_probe(breaker, clock):
+    trip(breaker)
+    clock.now += 10.0
+    breaker.allow_request()
+    breaker.release_trial()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_release_trial_is_a_no_op_outside_half_open(breaker):
+    breaker.release_trial()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    trip(breaker)
+    breaker.release_trial()
+    assert breaker.is_open()
@@ -0,0 +1,109 @@
+"""Tests for cache value codecs."""
+import json
+
+import numpy as np
+import pytest
+
+from core.codecs import HEADER, MAGIC, CodecError, CodecRegistry
+
+RECORD = {"product_id": "p1", "predictions": [1.5, 2.0, 3.25], "model_used": "linear", "nested": {"a": [1, None]}}
+
+
+@pytest.fixture
+def registry():
+    return CodecRegistry({"forecast": "msgpack"} if _has("msgpack") else {})
+
+
+def _has(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize("value", ["", "plain text", "ünïcødé", RECORD, [1, 2, 3], 42, None, True])
+def test_round_trip(registry, value):
+    assert registry.decode(registry.encode("ai_insights:key", value)) == value
+
+
+def test_strings_are_stored_as_text_whatever_the_namespace(registry):
+    encoded = registry.encode("forecast:key", "text")
+    assert encoded[HEADER.size:] == b"text"
+
+
+def test_msgpack_namespace_round_trip():
+    pytest.importorskip("msgpack")
+    registry = CodecRegistry({"forecast": "msgpack"})
+    encoded = registry.encode("forecast:key", RECORD)
+    assert HEADER.unpack_from(encoded)[1] == 3
+    assert registry.decode(encoded) == RECORD
+
+
+@pytest.mark.parametrize("compression,module", [("zstd", "zstandard"), ("lz4", "lz4")])
+def test_compressed_round_trip(compression, module):
+    pytest.importorskip(module)
+    registry = CodecRegistry({}, compression=compression, compression_threshold=64)
+    value = {"rows": [RECORD] * 50}
+    encoded = registry.encode("ai_insights:key", value)
+
+    assert HEADER.unpack_from(encoded)[2] != 0
+    assert len(encoded) < len(json.dumps(value))
+    assert registry.decode(encoded) == value
+
+
+def test_small_values_are_not_compressed():
+    registry = CodecRegistry({}, compression="zstd" if _has("zstandard") else "none", compression_threshold=4096)
+    assert HEADER.unpack_from(registry.encode("ai_insights:key", RECORD))[2] == 0
+
+
+@pytest.mark.parametrize("array", [
+    np.arange(12, dtype=np.float64).reshape(3, 4),
+    np.arange(10, dtype=np.int32),
+    np.array(3.5),
+    np.zeros((0, 3), dtype=np.float32),
+    np.arange(20, dtype=np.int64).reshape(4, 5)[:, ::2],
+    np.arange(6, dtype=np.float64).reshape(2, 3).T,
+])
+def test_numpy_round_trip(registry, array):
+    decoded = registry.decode(registry.encode("forecast:key", array))
+    assert decoded.dtype == array.dtype
+    assert decoded.shape == array.shape
+    np.testing.assert_array_equal(decoded, array)
+
+
+def test_decoded_arrays_are_read_only_views(registry):
+    decoded = registry.decode(registry.encode("forecast:key", np.arange(4.0)))
+    assert not decoded.flags.writeable
+
+
+def test_object_arrays_are_rejected(registry):
+    with pytest.raises(CodecError):
+        registry.encode("forecast:key", np.array([{"a": 1}], dtype=object))
+
+
+def test_untagged_values_are_read_as_text(registry):
+    assert registry.decode(b"legacy insights") == "legacy insights"
+    assert registry.decode(json.dumps(RECORD).encode()) == RECORD
+    assert registry.decode(b"{not json") == "{not json"
+
+
+@pytest.mark.parametrize("data", [
+    MAGIC + bytes([99, 0]) + b"payload",
+    MAGIC + bytes([2, 0]) + b"{truncated",
+    MAGIC + bytes([2, 7]) + b"{}",
+    MAGIC + bytes([4, 0]) + b"\x05<f8",
+    MAGIC + bytes([1, 0]) + b"\xff\xfe",
+    b"\xff\xfe not utf-8",
+    MAGIC,
+])
+def test_corrupt_values_raise_codec_error(registry, data):
+    with pytest.raises(CodecError):
+        registry.decode(data)
+
+
+def test_unknown_codecs_are_rejected_at_configuration():
+    with pytest.raises(ValueError):
+        CodecRegistry({"forecast": "pickle"})
+    with pytest.raises(ValueError):
+        CodecRegistry({}, compression="gzip")
@@ -0,0 +1,107 @@
+"""Tests for data change events retiring cached forecasts and prices."""
+import pytest
+
+import main
+from config.settings import settings
+from core.circuit_breaker import CircuitBreaker
+from core.watermarks import DataWatermarks, data_watermarks
+from services import event_consumer as event_consumer_module
+from services.event_consumer import INVENTORY_STREAM, ORDER_ITEMS_STREAM, RETRAIN_PENDING_KEY, EventConsumer
+from services.ml_service import forecast_cache_key
+from services.product_categories import ProductCategories
+
+CATEGORIES = {"milk": "dairy", "cheese": "dairy", "bread": "bakery"}
+
+
+@pytest.fixture
+def categories(monkeypatch):
+    async def fetch_all(query, params):
+        return [
+            {"id": product_id, "category": CATEGORIES[product_id]}
+            for product_id in params["product_ids"] if product_id in CATEGORIES
+        ]
+
+    product_categories = ProductCategories(100, 60)
+    monkeypatch.setattr("services.product_categories.db_manager.fetch_all", fetch_all)
+    monkeypatch.setattr(event_consumer_module, "product_categories", product_categories)
+    monkeypatch.setattr(main, "product_categories", product_categories)
+    return product_categories
+
+
+@pytest.fixture
+async def consumer(fake_redis, categories):
+    consumer = EventConsumer()
+    await consumer._ensure_groups()
+    return consumer
+
+
+async def forecast_key(product_id: str) -> str:
+    version = await data_watermarks.get(DataWatermarks.PRODUCTS, product_id)
+    return forecast_cache_key(product_id, version, "2024-01-01", "2024-03-31", 30)
+
+
+async def test_restarts_do_not_count_against_the_circuit(consumer, fake_redis):
+    for _ in range(3):
+        await consumer._ensure_groups()
+    assert fake_redis.circuit_breaker.state == CircuitBreaker.CLOSED
+    assert fake_redis.circuit_breaker.failures == 0
+
+
+async def test_order_events_retire_forecasts(consumer, fake_redis):
+    before = {product_id: await forecast_key(product_id) for product_id in ("milk", "bread")}
+    await fake_redis.client.xadd(ORDER_ITEMS_STREAM, {"product_id": "milk", "quantity": "3"})
+
+    assert await consumer.consume_once() == 1
+    assert await forecast_key("milk") != before["milk"]
+    assert await forecast_key("bread") == before["bread"]
+    assert await fake_redis.client.smembers(RETRAIN_PENDING_KEY) == {b"milk"}
+
+
+async def test_events_retire_prices_across_the_category(consumer, fake_redis):
+    before = {product_id: await main.price_versions(product_id, []) for product_id in CATEGORIES}
+    await fake_redis.client.xadd(ORDER_ITEMS_STREAM, {"product_id": "milk"})
+    await consumer.consume_once()
+
+    assert await main.price_versions("milk", []) != before["milk"]
+    assert (await main.price_versions("cheese", []))[0] == before["cheese"][0]
+    assert (await main.price_versions("cheese", []))[1] != before["cheese"][1]
+    assert await main.price_versions("bread", []) == before["bread"]
+
+
+async def test_events_retire_prices_using_the_product_as_competitor(consumer, fake_redis):
+    before = await main.price_versions("bread", ["milk", "cheese"])
+    await fake_redis.client.xadd(ORDER_ITEMS_STREAM, {"product_id": "cheese"})
+    await consumer.consume_once()
+    assert await main.price_versions("bread", ["milk", "cheese"]) != before
+
+
+async def test_inventory_events_retire_buyer_data(consumer, fake_redis):
+    await fake_redis.client.xadd(INVENTORY_STREAM, {"product_id": "bread", "buyer_id": "b1"})
+    await fake_redis.client.xadd(ORDER_ITEMS_STREAM, {"product_id": "bread", "buyer_id": "b2"})
+    await consumer.consume_once()
+
+    assert await data_watermarks.get_many(DataWatermarks.BUYERS, ["b1", "b2"]) == {"b1": 1, "b2": 0}
+    assert await data_watermarks.get(DataWatermarks.CATEGORIES, "bakery") == 1
+    assert consumer.stats["events"] == 2
+
+
+async def test_handled_events_are_acknowledged(consumer, fake_redis):
+    await fake_redis.client.xadd(ORDER_ITEMS_STREAM, {"product_id": "milk"})
+    await consumer.consume_once()
+
+    pending = await fake_redis.client.xpending(ORDER_ITEMS_STREAM, settings.event_consumer_group)
+    assert pending["pending"] == 0
+    assert await consumer.consume_once() == 0
+
+
+async def test_failed_batches_stay_pending(consumer, fake_redis, monkeypatch):
+    async def unavailable(product_ids):
+        raise ConnectionError("database down")
+
+    monkeypatch.setattr(event_consumer_module.product_categories, "get_many", unavailable)
+    await fake_redis.client.xadd(ORDER_ITEMS_STREAM, {"product_id": "milk"})
+    with pytest.raises(ConnectionError):
+        await consumer.consume_once()
+
+    pending = await fake_redis.client.xpending(ORDER_ITEMS_STREAM, settings.event_consumer_group)
+    assert pending["pending"] == 1
@@ -0,0 +1,163 @@
+"""Tests for the Groq HTTP client against a local stub of the chat completions API."""
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from config.settings import settings
+from core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.ai_service import AIService
+
+
+class StubGroqServer(ThreadingHTTPServer):
+    """Answers chat completions with a canned reply or a configured error status."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubGroqHandler)
+        self.requests = []
+        self.status = 200
+        self.reply = "Restock the best sellers."
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/openai/v1"
+
+
+class StubGroqHandler(BaseHTTPRequestHandler):
+    server: StubGroqServer
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append({"path": self.path, "headers": dict(self.headers), "body": body})
+
+        if self.server.status != 200:
+            self._send(self.server.status, "application/json", b'{"error": {"message": "stub error"}}')
+        elif body.get("stream"):
+            events = [
+                {"choices": [{"delta": {"content": self.server.reply[i:i + 5]}}]}
+                for i in range(0, len(self.server.reply), 5)
+            ]
+            chunks = [f"data: {json.dumps(event)}\n\n" for event in events] + ["data: [DONE]\n\n"]
+            self._send(200, "text/event-stream", "".join(chunks).encode())
+        else:
+            response = {
+                "choices": [{"message": {"role": "assistant", "content": self.server.reply}}],
+                "usage": {"prompt_tokens": 12, "completion_tokens": 5},
+            }
+            self._send(200, "application/json", json.dumps(response).encode())
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def groq_stub():
+    server = StubGroqServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+async def service(groq_stub, fake_redis, monkeypatch):
+    monkeypatch.setattr(settings, "groq_api_key", "test-key")
+    monkeypatch.setattr(settings, "groq_base_url", groq_stub.base_url)
+    monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+    service = AIService()
+    service.circuit_breaker = CircuitBreaker("groq", 2, 30.0)
+    yield service
+    await service.close()
+
+
+MESSAGES = [{"role": "user", "content": "How should I restock?"}]
+
+
+async def test_chat_completion(service, groq_stub):
+    assert await service._chat_completion(MESSAGES, max_tokens=50) == "Restock the best sellers."
+
+    request = groq_stub.requests[0]
+    assert request["path"] == "/openai/v1/chat/completions"
+    assert request["headers"]["Authorization"] == "Bearer test-key"
+    assert request["body"]["model"] == settings.groq_model
+    assert request["body"]["messages"] == MESSAGES
+    assert request["body"]["max_tokens"] == 50
+    assert service.get_llm_stats()["calls"] == 1
+    assert service.get_llm_stats()["prompt_tokens"] == 12
+
+
+async def test_streamed_chat_completion(service, groq_stub):
+    chunks = [chunk async for chunk in service._stream_chat_completion(MESSAGES)]
+    assert len(chunks) > 1
+    assert "".join(chunks) == groq_stub.reply
+    assert groq_stub.requests[0]["body"]["stream"] is True
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_server_errors_open_the_circuit(service, groq_stub):
+    groq_stub.status = 503
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await service._chat_completion(MESSAGES)
+
+    with pytest.raises(CircuitOpenError):
+        await service._chat_completion(MESSAGES)
+    assert len(groq_stub.requests) == 2
+
+
+async def test_client_errors_do_not_open_the_circuit(service, groq_stub):
+    groq_stub.status = 400
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await service._chat_completion(MESSAGES)
+    assert service.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_rate_limited_responses_count_as_failures(service, groq_stub):
+    groq_stub.status = 429
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await service._chat_completion(MESSAGES)
+    assert service.circuit_breaker.state == CircuitBreaker.OPEN
+
+
+async def test_insights_are_cached(service, groq_stub):
+    prompt = "Which categories are growing in the stub test?"
+    assert await service.get_business_insights(prompt) == groq_stub.reply
+    assert await service.get_business_insights(prompt) == groq_stub.reply
+    assert len(groq_stub.requests) == 1
+
+
+async def test_insights_fall_back_on_server_errors(service, groq_stub):
+    groq_stub.status = 500
+    insights = await service.get_business_insights("Anything unusual in the stub failure test?")
+    assert insights
+    assert insights != groq_stub.reply
+
+
+@pytest.mark.parametrize("job_id", ["hot_products", "hot_request:p1", "", "A" * 64, "0" * 63, "0" * 64 + ":x"])
+async def test_insights_jobs_only_accept_digests(service, fake_redis, monkeypatch, job_id):
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("Redis read for an invalid job id")
+
+    monkeypatch.setattr(fake_redis, "get", unexpected)
+    assert await service.get_insights_job(job_id) is None
+
+
+async def test_submitted_insights_job_is_found(service, groq_stub):
+    job = await service.submit_insights_job("What should I reorder for the job test?")
+    await asyncio.gather(*service._background_jobs)
+    found = await service.get_insights_job(job["job_id"])
+    assert found["status"] == "ready"
+    assert found["insights"] == groq_stub.reply
@@ -0,0 +1,120 @@
+"""Tests for consistent hashing and sharded Redis access."""
+import pytest
+
+from config.settings import settings
+from core.hash_ring import HashRing
+from core.redis_client import RedisManager
+
+from tests.redis_helpers import use_fake_node, use_fake_redis
+
+KEYS = [f"ai:insights:{i}" for i in range(5000)]
+NODE_URLS = ["redis://cache-a:6379/0", "redis://cache-b:6379/0", "redis://cache-c:6379/0"]
+
+
+def test_empty_ring_owns_nothing():
+    assert HashRing().get_node("key") is None
+
+
+def test_keys_spread_evenly():
+    ring = HashRing(["a", "b", "c", "d"])
+    counts = {node: len(keys) for node, keys in ring.group(KEYS).items()}
+    assert set(counts) == {"a", "b", "c", "d"}
+    for count in counts.values():
+        assert abs(count - len(KEYS) / 4) < len(KEYS) / 4 * 0.25
+
+
+def test_adding_a_node_only_moves_keys_to_it():
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.get_node(key) for key in KEYS}
+    ring.add_node("d")
+    moved = [key for key in KEYS if ring.get_node(key) != before[key]]
+
+    assert all(ring.get_node(key) == "d" for key in moved)
+    assert abs(len(moved) - len(KEYS) / 4) < len(KEYS) / 4 * 0.25
+
+
+def test_removing_a_node_only_moves_its_keys():
+    ring = HashRing(["a", "b", "c", "d"])
+    before = {key: ring.get_node(key) for key in KEYS}
+    ring.remove_node("d")
+
+    for key in KEYS:
+        if before[key] != "d":
+            assert ring.get_node(key) == before[key]
+        else:
+            assert ring.get_node(key) in {"a", "b", "c"}
+
+
+def test_remove_then_add_restores_mapping():
+    ring = HashRing(["a", "b", "c"])
+    before = {key: ring.get_node(key) for key in KEYS}
+    ring.remove_node("b")
+    ring.add_node("b")
+    assert {key: ring.get_node(key) for key in KEYS} == before
+
+
+def test_mapping_is_independent_of_insertion_order():
+    forward = HashRing(["a", "b", "c"])
+    backward = HashRing(["c", "b", "a"])
+    assert all(forward.get_node(key) == backward.get_node(key) for key in KEYS)
+
+
+def test_group_preserves_key_order():
+    ring = HashRing(["a", "b", "c"])
+    for node, keys in ring.group(KEYS).items():
+        assert keys == [key for key in KEYS if ring.get_node(key) == node]
+
+
+@pytest.fixture
+def sharded_redis(monkeypatch):
+    """A RedisManager sharding over three in-memory Redis servers."""
+    monkeypatch.setattr(settings, "redis_cache_urls", NODE_URLS)
+    return use_fake_redis(RedisManager(), monkeypatch)
+
+
+async def test_values_are_stored_on_their_owning_node(sharded_redis):
+    values = {key: {"value": i} for i, key in enumerate(KEYS[:200])}
+    assert await sharded_redis.set_many(values, ttl=60)
+
+    for node_name, keys in sharded_redis.ring.group(values).items():
+        node = sharded_redis.nodes[node_name]
+        assert await node.client.exists(*keys) == len(keys)
+    assert await sharded_redis.get_many(list(values)) == values
+    assert await sharded_redis.get(KEYS[7]) == {"value": 7}
+
+
+async def test_get_many_reports_missing_keys(sharded_redis):
+    await sharded_redis.set(KEYS[0], "present")
+    assert await sharded_redis.get_many(KEYS[:3]) == {KEYS[0]: "present", KEYS[1]: None, KEYS[2]: None}
+
+
+async def test_added_node_serves_only_remapped_keys(sharded_redis, monkeypatch):
+    values = {key: i for i, key in enumerate(KEYS[:300])}
+    await sharded_redis.set_many(values)
+    before = {key: sharded_redis.ring.get_node(key) for key in values}
+
+    new_node = use_fake_node(sharded_redis.add_node("redis://cache-d:6379/0"), monkeypatch)
+    sharded_redis.fallback_cache.clear()
+    results = await sharded_redis.get_many(list(values))
+
+    for key, value in values.items():
+        if sharded_redis.ring.get_node(key) == new_node.name:
+            assert results[key] is None
+        else:
+            assert sharded_redis.ring.get_node(key) == before[key]
+            assert results[key] == value
+
+
+async def test_job_records_stay_on_primary(sharded_redis, monkeypatch):
+    from core import job_queue as job_queue_module
+
+    monkeypatch.setattr(job_queue_module, "redis_manager", sharded_redis)
+    queue = job_queue_module.JobQueue("sharding-test")
+    jobs = [await queue.enqueue("insights", {"prompt": str(i)}) for i in range(50)]
+
+    for job in jobs:
+        assert (await queue.get_job(job["job_id"]))["payload"] == job["payload"]
+        job["status"] = queue.COMPLETED
+        await queue.save_job(job)
+        assert await sharded_redis.primary.client.exists(queue.job_key(job["job_id"]))
+        assert (await queue.get_job(job["job_id"]))["status"] == queue.COMPLETED
@@ -0,0 +1,121 @@
+"""Tests for the Redis job queue and its worker."""
+import asyncio
+
+import pytest
+
+from config.settings import settings
+from core.job_queue import JobQueue
+from services import job_worker
+from services.job_worker import JobWorker
+
+
+@pytest.fixture
+def queue(fake_redis):
+    return JobQueue("test")
+
+
+async def test_jobs_are_claimed_in_fifo_order(queue):
+    first = await queue.enqueue("insights", {"prompt": "a"})
+    second = await queue.enqueue("insights", {"prompt": "b"})
+
+    assert await queue.claim() == first["job_id"]
+    assert await queue.claim() == second["job_id"]
+    assert await queue.claim() is None
+    assert await queue.get_stats() == {"pending": 0, "processing": 2}
+
+
+async def test_enqueue_stores_the_record(queue):
+    job = await queue.enqueue("insights", {"prompt": "a"}, max_attempts=5)
+    stored = await queue.get_job(job["job_id"])
+    assert stored == job
+    assert stored["status"] == JobQueue.QUEUED
+    assert stored["max_attempts"] == 5
+
+
+async def test_ack_removes_the_claim(queue):
+    job = await queue.enqueue("insights", {})
+    await queue.claim()
+    await queue.ack(job["job_id"])
+    assert await queue.get_stats() == {"pending": 0, "processing": 0}
+
+
+async def test_expired_claim_is_requeued(queue, monkeypatch):
+    monkeypatch.setattr(settings, "job_visibility_timeout", 0.05)
+    job = await queue.enqueue("insights", {})
+
+    assert await queue.claim() == job["job_id"]
+    assert await queue.claim() is None
+    await asyncio.sleep(0.1)
+    assert await queue.claim() == job["job_id"]
+
+
+async def test_retry_later_delays_requeue(queue, monkeypatch):
+    monkeypatch.setattr(settings, "job_visibility_timeout", 0.05)
+    job = await queue.enqueue("insights", {})
+    await queue.claim()
+
+    await queue.retry_later(job["job_id"], 0.3)
+    await asyncio.sleep(0.1)
+    assert await queue.claim() is None
+    await asyncio.sleep(0.3)
+    assert await queue.claim() == job["job_id"]
+
+
+async def test_worker_completes_job(queue, monkeypatch):
+    async def handler(payload):
+        return {"echo": payload["prompt"]}
+
+    monkeypatch.setitem(job_worker.JOB_HANDLERS, "insights", handler)
+    job = await queue.enqueue("insights", {"prompt": "hello"})
+
+    await JobWorker(queue).process(await queue.claim())
+
+    stored = await queue.get_job(job["job_id"])
+    assert stored["status"] == JobQueue.COMPLETED
+    assert stored["result"] == {"echo": "hello"}
+    assert stored["attempts"] == 1
+    assert await queue.get_stats() == {"pending": 0, "processing": 0}
+
+
+async def test_worker_retries_then_fails(queue, monkeypatch):
+    monkeypatch.setattr(settings, "job_retry_backoff", 0.0)
+    calls = []
+
+    async def handler(payload):
+        calls.append(payload)
+        raise ValueError("model unavailable")
+
+    monkeypatch.setitem(job_worker.JOB_HANDLERS, "insights", handler)
+    job = await queue.enqueue("insights", {}, max_attempts=2)
+    worker = JobWorker(queue)
+
+    await worker.process(await queue.claim())
+    stored = await queue.get_job(job["job_id"])
+    assert stored["status"] == JobQueue.RETRYING
+    assert stored["error"] == "model unavailable"
+
+    await asyncio.sleep(0.01)
+    await worker.process(await queue.claim())
+    stored = await queue.get_job(job["job_id"])
+    assert stored["status"] == JobQueue.FAILED
+    assert stored["attempts"] == 2
+    assert len(calls) == 2
+    assert await queue.get_stats() == {"pending": 0, "processing": 0}
+
+
+async def test_worker_fails_unknown_job_type(queue):
+    job = await queue.enqueue("no_such_job", {})
+    await JobWorker(queue).process(await queue.claim())
+
+    stored = await queue.get_job(job["job_id"])
+    assert stored["status"] == JobQueue.FAILED
+    assert stored["error"] == "Unknown job type no_such_job"
+
+
+async def test_worker_drops_expired_records(queue, fake_redis):
+    job = await queue.enqueue("insights", {})
+    job_id = await queue.claim()
+    await fake_redis.client.delete(queue.job_key(job["job_id"]))
+
+    await JobWorker(queue).process(job_id)
+    assert await queue.get_stats() == {"pending": 0, "processing": 0}
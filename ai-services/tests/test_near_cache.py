@@ -0,0 +1,89 @@
+"""Tests for near cache invalidation across workers."""
+import asyncio
+
+import pytest
+
+from core.near_cache import NearCache
+
+
+async def until(condition, timeout: float = 1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def workers(fake_redis):
+    """Two near caches sharing one Redis, as in two API workers."""
+    caches = [NearCache(fake_redis, 100, 60, "test:invalidations") for _ in range(2)]
+    for cache in caches:
+        cache.start()
+    # Let both listeners subscribe before anything is published
+    await asyncio.sleep(0.05)
+    yield caches
+    for cache in caches:
+        await cache.stop()
+
+
+async def test_reads_fill_the_local_copy(workers):
+    first, second = workers
+    await first.set("ai_insights:a", "one")
+    assert await second.get("ai_insights:a") == "one"
+    assert await second.get("ai_insights:a") == "one"
+    assert second.stats["remote_hits"] == 1
+    assert second.stats["local_hits"] == 1
+
+
+async def test_writes_drop_other_workers_copies(workers):
+    first, second = workers
+    await first.set("ai_insights:a", "one")
+    await second.get("ai_insights:a")
+
+    await first.set("ai_insights:a", "two")
+    await until(lambda: "ai_insights:a" not in second.local)
+    assert await second.get("ai_insights:a") == "two"
+    assert first.stats["invalidations_received"] == 0
+
+
+async def test_deletes_drop_other_workers_copies(workers):
+    first, second = workers
+    await first.set("ai_insights:a", "one")
+    await second.get("ai_insights:a")
+
+    await first.delete("ai_insights:a")
+    await until(lambda: "ai_insights:a" not in second.local)
+    assert await second.get("ai_insights:a") is None
+
+
+async def test_precomputed_values_drop_other_workers_copies(workers):
+    first, second = workers
+    await first.set("ai_insights:a", "one")
+    await second.get("ai_insights:a")
+
+    await first.store_computed({"ai_insights:a": "batch"}, ttl=60)
+    await until(lambda: "ai_insights:a" not in second.local)
+    assert await second.get("ai_insights:a") == "batch"
+
+
+async def test_full_invalidation_runs_clear_callbacks_everywhere(workers):
+    first, second = workers
+    cleared = {id(first): [], id(second): []}
+    for cache in workers:
+        cache.on_clear(cleared[id(cache)].append)
+    await first.set("ai_insights:a", "one")
+    await second.get("ai_insights:a")
+
+    await first.invalidate(namespaces=["ai_insights"])
+    await until(lambda: cleared[id(second)])
+    assert cleared == {id(first): [["ai_insights"]], id(second): [["ai_insights"]]}
+    assert len(second.local) == 0
+
+
+async def test_malformed_messages_are_ignored(workers, fake_redis):
+    first, second = workers
+    await first.set("ai_insights:a", "one")
+    await fake_redis.publish("test:invalidations", "not json")
+    await first.invalidate(keys=["ai_insights:other"])
+    await until(lambda: second.stats["invalidations_received"] == 2)
+    assert first.local.get("ai_insights:a") == "one"
@@ -0,0 +1,57 @@
+"""Tests for price elasticity fitting and the price grid simulation."""
+import numpy as np
+import pytest
+
+from config.settings import settings
+from services.ml_service import ml_service
+
+
+def market(points):
+    return [{"price": price, "avg_quantity_sold": quantity} for price, quantity in points]
+
+
+def test_elasticity_fit():
+    data = market((price, 1000 * price ** -1.5) for price in (2, 4, 8, 16))
+    elasticity, intercept, model = ml_service._fit_price_elasticity(data)
+    assert elasticity == pytest.approx(-1.5)
+    assert np.exp(intercept) == pytest.approx(1000)
+    assert model == "linear_demand_category_elasticity"
+
+
+def test_default_elasticity_without_enough_data():
+    elasticity, intercept, model = ml_service._fit_price_elasticity(market([(5, 10), (10, 8)]))
+    assert elasticity == settings.default_price_elasticity
+    assert intercept is None
+    assert model == "linear_demand_default_elasticity"
+
+
+def test_clipped_fits_stay_anchored_on_observed_volumes():
+    # Upward-sloping demand is clipped to -0.1, the curve still passes through the data
+    data = market([(5, 10), (10, 20), (20, 40)])
+    elasticity, intercept, _ = ml_service._fit_price_elasticity(data)
+    assert elasticity == -0.1
+    assert np.exp(intercept + elasticity * np.log(10)) == pytest.approx(20, rel=0.05)
+
+    result = ml_service.simulate_price_grid(data, 10, 0, 10, 10, 1)
+    assert result["optimal_volume"] == pytest.approx(20, rel=0.05)
+
+
+def test_revenue_optimum_is_interior():
+    result = ml_service.simulate_price_grid(market([]), 10, 100, 1, 20, 191)
+    # Linear demand 100 * (1 - 1.5 * (p / 10 - 1)) peaks in revenue at p = 25 / 3
+    assert result["optimal_price"] == pytest.approx(25 / 3, abs=0.1)
+    assert result["optimal_profit"] is None
+    assert result["curve"]["projected_profit"] is None
+    assert len(result["curve"]["prices"]) == 191
+
+
+def test_profit_optimum_accounts_for_unit_cost():
+    revenue = ml_service.simulate_price_grid(market([]), 10, 100, 1, 20, 191)
+    profit = ml_service.simulate_price_grid(market([]), 10, 100, 1, 20, 191, unit_cost=4.0)
+    assert profit["optimal_price"] > revenue["optimal_price"]
+    assert profit["optimal_profit"] == pytest.approx((profit["optimal_price"] - 4.0) * profit["optimal_volume"])
+
+
+def test_volumes_are_never_negative():
+    result = ml_service.simulate_price_grid(market([]), 10, 100, 1, 50, 50)
+    assert min(result["curve"]["projected_volume"]) == 0
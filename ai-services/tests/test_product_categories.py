@@ -0,0 +1,73 @@
+"""Tests for cached product categories and price recommendation versions."""
+import pytest
+
+import main
+from core.watermarks import DataWatermarks, data_watermarks
+from services import product_categories as product_categories_module
+from services.product_categories import ProductCategories
+
+CATEGORIES = {"milk": "dairy", "cheese": "dairy", "bread": "bakery", "loose": None}
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """Serve category lookups from a dict, recording the products queried."""
+    queried = []
+
+    async def fetch_all(query, params):
+        queried.append(sorted(params["product_ids"]))
+        return [
+            {"id": product_id, "category": CATEGORIES[product_id]}
+            for product_id in params["product_ids"] if product_id in CATEGORIES
+        ]
+
+    monkeypatch.setattr(product_categories_module.db_manager, "fetch_all", fetch_all)
+    return queried
+
+
+async def test_lookups_are_cached(queries):
+    categories = ProductCategories(100, 60)
+    assert await categories.get_many(["milk", "bread", "unknown"]) == {"milk": "dairy", "bread": "bakery", "unknown": None}
+    assert await categories.get_many(["milk", "unknown", "loose"]) == {"milk": "dairy", "unknown": None, "loose": None}
+    assert await categories.get("bread") == "bakery"
+
+    assert queries == [["bread", "milk", "unknown"], ["loose"]]
+    assert categories.stats == {"hits": 3, "misses": 4}
+
+
+async def test_expired_lookups_are_refreshed(queries):
+    categories = ProductCategories(100, 0)
+    await categories.get("milk")
+    await categories.get("milk")
+    assert len(queries) == 2
+
+
+async def test_price_versions_follow_the_category(fake_redis, queries, monkeypatch):
+    monkeypatch.setattr(main, "product_categories", ProductCategories(100, 60))
+    before = await main.price_versions("milk", [])
+
+    await data_watermarks.bump(DataWatermarks.CATEGORIES, ["bakery"])
+    assert await main.price_versions("milk", []) == before
+
+    await data_watermarks.bump(DataWatermarks.CATEGORIES, ["dairy"])
+    after = await main.price_versions("milk", [])
+    assert after[0] == before[0]
+    assert after[1] != before[1]
+    assert len(queries) == 1
+
+
+async def test_price_versions_follow_competitors(fake_redis, queries):
+    before = await main.price_versions("milk", ["cheese", "bread"])
+    await data_watermarks.bump(DataWatermarks.PRODUCTS, ["bread"])
+    after = await main.price_versions("milk", ["cheese", "bread"])
+
+    assert after[0] == before[0]
+    assert after[1] != before[1]
+    assert (await main.price_versions("milk", ["cheese"]))[1] != after[1]
+    assert queries == []
+
+
+async def test_price_versions_follow_the_product(fake_redis, queries):
+    before = await main.price_versions("milk", ["cheese"])
+    await data_watermarks.bump(DataWatermarks.PRODUCTS, ["milk"])
+    assert (await main.price_versions("milk", ["cheese"]))[0] == before[0] + 1
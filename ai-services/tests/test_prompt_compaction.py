@@ -0,0 +1,116 @@
+"""Tests for prompt context compaction."""
+import copy
+import json
+
+import numpy as np
+
+from services.prompt_compaction import (
+    compact_context,
+    dumps_compact,
+    estimate_tokens,
+    summarize_context,
+    summarize_series,
+)
+
+DEMAND = [float(20 + i + (5 if i % 7 == 5 else 0)) for i in range(60)]
+DAILY = [{"date": f"2024-01-{i + 1:02d}", "quantity": 10.0 + i, "revenue": 100.0 + 10 * i} for i in range(20)]
+PRODUCTS = [{"id": f"product-{i}", "name": f"Product {i}", "price": 9.99 + i, "stock": 100 - i} for i in range(40)]
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hello world") == 4
+    assert estimate_tokens('{"a":1}') == 7
+
+
+def test_summarize_series():
+    summary = summarize_series(DEMAND)
+    assert summary["n"] == 60
+    assert summary["min"] == 20.0
+    assert summary["last"] == 79.0
+    assert summary["trend_pct"] > 0
+    assert summary["weekly_seasonality"] > 0.9
+    assert len(summary["sparkline"]) == 8
+
+
+def test_summarize_short_and_empty_series():
+    assert summarize_series([]) == {"n": 0}
+    summary = summarize_series([5.0])
+    assert "trend_pct" not in summary
+    assert "sparkline" not in summary
+
+
+def test_short_lists_are_kept_verbatim():
+    context = {"recent": [1.0, 2.0, 3.0], "tags": ["dairy", "fresh"]}
+    assert summarize_context(context) == context
+
+
+def test_long_numeric_lists_are_summarized():
+    compacted = summarize_context({"historical_demand": DEMAND, "product": "milk"})
+    assert compacted["product"] == "milk"
+    assert compacted["historical_demand"] == summarize_series(DEMAND)
+
+
+def test_time_series_records_become_columns():
+    compacted = summarize_context({"daily": DAILY})["daily"]
+    assert compacted["date"] == {"from": "2024-01-01", "to": "2024-01-20"}
+    assert compacted["quantity"]["n"] == 20
+    assert compacted["revenue"]["max"] == 290.0
+
+
+def test_other_records_are_kept():
+    compacted = summarize_context({"products": PRODUCTS})
+    assert [product["id"] for product in compacted["products"]] == [product["id"] for product in PRODUCTS]
+    assert compacted["products"][1]["price"] == 10.99
+
+
+def test_floats_are_rounded():
+    assert summarize_context({"score": 0.123456789}) == {"score": 0.1235}
+    assert summarize_series(np.array([1.0, 2.0, 4.0]))["mean"] == 2.33
+
+
+def test_empty_context():
+    assert compact_context(None, 100) == "No additional context"
+    assert compact_context({}, 100) == "No additional context"
+
+
+def test_context_within_budget_is_not_truncated():
+    text = compact_context({"historical_demand": DEMAND}, 1000)
+    assert "truncated" not in json.loads(text)
+
+
+def test_sparklines_shrink_before_truncating():
+    context = {"historical_demand": DEMAND}
+    full = compact_context(context, 10000)
+    budget = estimate_tokens(full) - 5
+
+    compacted = json.loads(compact_context(context, budget))
+    assert "truncated" not in compacted
+    assert len(compacted["historical_demand"]["sparkline"]) < 8
+
+
+def test_budget_is_enforced():
+    context = {"products": PRODUCTS, "daily": DAILY, "notes": "restock " * 200}
+    for budget in (50, 150, 400, 1000):
+        text = compact_context(context, budget)
+        assert estimate_tokens(text) <= budget
+        compacted = json.loads(text)
+        assert compacted["truncated"] is True
+        assert compacted["products"]
+
+
+def test_context_is_not_mutated():
+    context = {"products": PRODUCTS, "daily": DAILY, "historical_demand": DEMAND}
+    original = copy.deepcopy(context)
+    compact_context(context, 60)
+    assert context == original
+
+
+def test_unreachable_budget():
+    assert compact_context({"products": PRODUCTS}, 3) == "No additional context"
+
+
+def test_output_is_compact_json():
+    text = compact_context({"a": [1, 2], "b": "c"}, 100)
+    assert text == dumps_compact({"a": [1, 2], "b": "c"})
+    assert " " not in text
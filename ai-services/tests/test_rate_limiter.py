@@ -0,0 +1,112 @@
+"""Tests for the shared and local token buckets and priority admission."""
+import asyncio
+
+import pytest
+import redis
+
+from core.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def limiter(fake_redis):
+    return RateLimiter("test", requests_per_minute=6, tokens_per_minute=600)
+
+
+@pytest.mark.parametrize("clock", [0.0, 1000.0], indirect=True)
+def test_local_bucket_admits_up_to_capacity(limiter, clock):
+    for _ in range(6):
+        assert limiter._try_take_local(10) == 0
+    assert limiter._try_take_local(10) == pytest.approx(10.0)
+
+
+def test_local_bucket_refills_over_time(limiter, clock):
+    for _ in range(6):
+        limiter._try_take_local(10)
+
+    clock.now += 5.0
+    assert limiter._try_take_local(10) == pytest.approx(5.0)
+    clock.now += 5.0
+    assert limiter._try_take_local(10) == 0
+    assert limiter._try_take_local(10) == pytest.approx(10.0)
+
+
+def test_local_bucket_limits_tokens(limiter, clock):
+    assert limiter._try_take_local(500) == 0
+    assert limiter._try_take_local(200) == pytest.approx(10.0)
+
+    clock.now += 10.0
+    assert limiter._try_take_local(200) == 0
+
+
+def test_local_bucket_takes_nothing_when_short(limiter, clock):
+    assert limiter._try_take_local(550) == 0
+    assert limiter._try_take_local(100) > 0
+    assert limiter._try_take_local(50) == 0
+
+
+async def test_shared_bucket_admits_up_to_capacity(limiter):
+    for _ in range(6):
+        assert await limiter._try_take(10) == 0
+    assert await limiter._try_take(10) == pytest.approx(10.0, abs=0.1)
+
+
+async def test_shared_bucket_is_shared_between_limiters(limiter):
+    other = RateLimiter("test", requests_per_minute=6, tokens_per_minute=600)
+    for _ in range(3):
+        assert await limiter._try_take(10) == 0
+        assert await other._try_take(10) == 0
+    assert await other._try_take(10) > 0
+
+
+async def test_falls_back_to_local_bucket_without_redis(limiter, fake_redis, monkeypatch):
+    async def unavailable(command, node=None):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(fake_redis, "execute", unavailable)
+    for _ in range(6):
+        assert await limiter._try_take(10) == 0
+    assert await limiter._try_take(10) > 0
+
+
+async def test_interactive_callers_are_admitted_first(limiter, monkeypatch):
+    blocked = True
+
+    async def try_take(tokens):
+        return 0.01 if blocked else 0
+
+    monkeypatch.setattr(limiter, "_try_take", try_take)
+    admitted = []
+
+    async def acquire(name, priority):
+        await limiter.acquire(10, priority)
+        admitted.append(name)
+
+    tasks = [
+        asyncio.ensure_future(acquire("background-1", RateLimiter.BACKGROUND)),
+        asyncio.ensure_future(acquire("background-2", RateLimiter.BACKGROUND)),
+        asyncio.ensure_future(acquire("interactive", RateLimiter.INTERACTIVE)),
+    ]
+    await asyncio.sleep(0.02)
+    assert limiter.get_metrics()["queue_depth_by_priority"] == {RateLimiter.BACKGROUND: 2, RateLimiter.INTERACTIVE: 1}
+
+    blocked = False
+    await asyncio.gather(*tasks)
+    assert admitted == ["interactive", "background-1", "background-2"]
+    assert limiter.get_metrics()["priorities"][RateLimiter.BACKGROUND]["admitted"] == 2
+
+
+async def test_cancelled_waiters_are_skipped(limiter, monkeypatch):
+    blocked = True
+
+    async def try_take(tokens):
+        return 0.01 if blocked else 0
+
+    monkeypatch.setattr(limiter, "_try_take", try_take)
+    cancelled = asyncio.ensure_future(limiter.acquire(10, RateLimiter.INTERACTIVE))
+    waiting = asyncio.ensure_future(limiter.acquire(10, RateLimiter.BACKGROUND))
+    await asyncio.sleep(0.02)
+    cancelled.cancel()
+
+    blocked = False
+    await asyncio.wait_for(waiting, 1)
+    assert limiter.get_metrics()["queue_depth"] == 0
@@ -0,0 +1,77 @@
+"""Tests for the Redis manager's circuit breaking."""
+import numpy as np
+import pytest
+import redis
+
+from core.circuit_breaker import CircuitBreaker
+from core.redis_client import RedisUnavailableError
+
+
+async def test_error_replies_do_not_open_the_circuit(fake_redis):
+    await fake_redis.client.rpush("ai_insights:list", "a")
+    for _ in range(10):
+        with pytest.raises(redis.ResponseError):
+            await fake_redis.execute(lambda: fake_redis.client.get("ai_insights:list"))
+        assert await fake_redis.get("ai_insights:list") is None
+
+    assert fake_redis.circuit_breaker.state == CircuitBreaker.CLOSED
+    assert fake_redis.is_available()
+
+
+async def test_busygroup_replies_do_not_open_the_circuit(fake_redis):
+    for _ in range(10):
+        try:
+            await fake_redis.execute(lambda: fake_redis.client.xgroup_create("events", "group", id="$", mkstream=True))
+        except redis.ResponseError as e:
+            assert "BUSYGROUP" in str(e)
+    assert fake_redis.circuit_breaker.failures == 0
+
+
+async def test_pipeline_error_replies_do_not_open_the_circuit(fake_redis):
+    await fake_redis.client.rpush("jobs:list", "a")
+    for _ in range(10):
+        with pytest.raises(redis.ResponseError):
+            async with fake_redis.pipeline() as pipe:
+                pipe.incr("jobs:list")
+    assert fake_redis.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_connection_errors_open_the_circuit(fake_redis, monkeypatch):
+    async def unreachable(*args, **kwargs):
+        raise redis.ConnectionError("connection refused")
+
+    monkeypatch.setattr(fake_redis.client, "get", unreachable)
+    threshold = fake_redis.circuit_breaker.failure_threshold
+    for _ in range(threshold):
+        with pytest.raises(redis.ConnectionError):
+            await fake_redis.execute(lambda: fake_redis.client.get("key"))
+
+    assert fake_redis.circuit_breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(RedisUnavailableError):
+        await fake_redis.execute(lambda: fake_redis.client.get("key"))
+
+
+async def test_timeouts_open_the_circuit(fake_redis, monkeypatch):
+    async def slow(*args, **kwargs):
+        raise redis.TimeoutError("timed out")
+
+    monkeypatch.setattr(fake_redis.client, "get", slow)
+    for _ in range(fake_redis.circuit_breaker.failure_threshold):
+        with pytest.raises(redis.TimeoutError):
+            await fake_redis.execute(lambda: fake_redis.client.get("key"))
+    assert fake_redis.circuit_breaker.state == CircuitBreaker.OPEN
+
+
+UNENCODABLE = np.array([{"a": 1}], dtype=object)
+
+
+async def test_set_rejects_unencodable_values(fake_redis):
+    assert not await fake_redis.set("forecast:bad", UNENCODABLE, ttl=60)
+    assert "forecast:bad" not in fake_redis.fallback_cache
+    assert not await fake_redis.client.exists("forecast:bad")
+
+
+async def test_set_many_skips_unencodable_values(fake_redis):
+    assert not await fake_redis.set_many({"forecast:bad": UNENCODABLE, "forecast:good": [1, 2]}, ttl=60)
+    assert "forecast:bad" not in fake_redis.fallback_cache
+    assert await fake_redis.get_many(["forecast:bad", "forecast:good"]) == {"forecast:bad": None, "forecast:good": [1, 2]}
@@ -0,0 +1,88 @@
+"""Tests for the near-duplicate prompt cache."""
+import pytest
+
+from config.settings import settings
+from services.ai_service import AIService
+from services.semantic_cache import SemanticCache
+
+MODEL = "test-model"
+CONTEXT = SemanticCache.context_digest(MODEL, {"category": "dairy"})
+
+
+@pytest.fixture
+def cache():
+    return SemanticCache(capacity=3, dimensions=1024, threshold=0.85)
+
+
+def test_empty_cache_misses(cache):
+    assert cache.lookup("What sells best?", CONTEXT) is None
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_paraphrases_hit(cache):
+    cache.store("Which dairy products sell best in winter?", CONTEXT, "Cheese and butter.")
+    assert cache.lookup("which DAIRY products sell best in winter", CONTEXT) == "Cheese and butter."
+    assert cache.lookup("What dairy products sell best in the winter?", CONTEXT) == "Cheese and butter."
+    assert cache.get_stats()["hits"] == 2
+
+
+def test_unrelated_prompts_miss(cache):
+    cache.store("Which dairy products sell best in winter?", CONTEXT, "Cheese and butter.")
+    cache.store("How do I reduce bakery waste?", CONTEXT, "Bake to order.")
+    assert cache.lookup("Which suppliers deliver late most often?", CONTEXT) is None
+
+
+def test_prompts_only_match_within_their_context(cache):
+    cache.store("Which dairy products sell best in winter?", CONTEXT, "Cheese and butter.")
+    other = SemanticCache.context_digest(MODEL, {"category": "bakery"})
+    assert cache.lookup("Which dairy products sell best in winter?", other) is None
+
+
+def test_context_digest_ignores_key_order():
+    assert SemanticCache.context_digest(MODEL, {"a": 1, "b": 2}) == SemanticCache.context_digest(MODEL, {"b": 2, "a": 1})
+    assert SemanticCache.context_digest(MODEL, {"a": 1}) != SemanticCache.context_digest("other-model", {"a": 1})
+    assert 0 <= SemanticCache.context_digest(MODEL, None) < 2 ** 63
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    cache.store("Forecast milk demand next week", CONTEXT, "milk")
+    cache.store("Forecast bread demand next week", CONTEXT, "bread")
+    cache.store("Forecast apple demand next week", CONTEXT, "apples")
+    assert cache.lookup("Forecast milk demand next week", CONTEXT) == "milk"
+
+    cache.store("Forecast cheese demand next week", CONTEXT, "cheese")
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_stats()["size"] == 3
+    assert cache.lookup("Forecast milk demand next week", CONTEXT) == "milk"
+    assert cache.lookup("Forecast cheese demand next week", CONTEXT) == "cheese"
+    assert cache.lookup("Forecast bread demand next week", CONTEXT) != "bread"
+
+
+def test_eviction_keeps_document_frequencies_consistent(cache):
+    for word in ["milk", "bread", "apple", "cheese", "butter"]:
+        cache.store(f"Forecast {word} demand", CONTEXT, word)
+    expected = (cache.vectors[:cache.size] > 0).sum(axis=0)
+    assert (cache.document_frequency == expected).all()
+
+
+def test_clear_drops_everything(cache):
+    cache.store("Which dairy products sell best in winter?", CONTEXT, "Cheese and butter.")
+    cache.clear()
+    assert cache.get_stats()["size"] == 0
+    assert not cache.document_frequency.any()
+    assert cache.lookup("Which dairy products sell best in winter?", CONTEXT) is None
+
+
+@pytest.mark.parametrize("namespaces,cleared", [
+    (None, True),
+    (["ai_insights"], True),
+    (["ai_insights:v2"], True),
+    (["price_optimization"], False),
+])
+def test_cache_clears_reach_the_semantic_cache(fake_redis, monkeypatch, namespaces, cleared):
+    monkeypatch.setattr(settings, "semantic_cache_enabled", True)
+    service = AIService()
+    service.semantic_cache.store("Which dairy products sell best?", CONTEXT, "Cheese.")
+
+    service._on_cache_clear(namespaces)
+    assert (service.semantic_cache.size == 0) == cleared
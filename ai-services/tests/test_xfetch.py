@@ -0,0 +1,156 @@
+"""Tests for XFetch early refreshes, leases and precomputed values."""
+import asyncio
+import time
+
+import pytest
+
+from core import redis_client as redis_client_module
+from core.redis_client import _xfetch_key
+
+
+class Compute:
+    """Counts calls and returns numbered values."""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return f"value-{self.calls}"
+
+
+@pytest.fixture
+def rand(monkeypatch):
+    """Pin the XFetch draw so -ln(1 - rand) is about 0.69."""
+    monkeypatch.setattr(redis_client_module.random, "random", lambda: 0.5)
+
+
+async def drain(manager):
+    await asyncio.gather(*manager._refreshes)
+
+
+async def test_miss_computes_and_stores_metadata(fake_redis):
+    compute = Compute()
+    assert await fake_redis.get_or_compute("ai_insights:a", compute, ttl=60, stale_ttl=30) == "value-1"
+
+    meta = await fake_redis.get(_xfetch_key("ai_insights:a"))
+    assert meta["expiry"] == pytest.approx(time.time() + 60, abs=2)
+    assert meta["delta"] >= 0
+    assert 60 < await fake_redis.ttl("ai_insights:a") <= 90
+    assert fake_redis.refresh_stats["computed"] == 1
+
+
+async def test_fresh_values_are_served_without_computing(fake_redis, rand):
+    compute = Compute()
+    await fake_redis.get_or_compute("ai_insights:a", compute, ttl=60)
+    for _ in range(5):
+        assert await fake_redis.get_or_compute("ai_insights:a", compute, ttl=60) == "value-1"
+    assert compute.calls == 1
+
+
+async def test_slow_values_are_refreshed_early(fake_redis, rand):
+    # Taking 100s to compute, a value with 60s left is due under XFetch
+    await fake_redis.store_computed({"ai_insights:a": "old"}, ttl=60, stale_ttl=30, delta=100.0)
+    compute = Compute()
+
+    assert await fake_redis.get_or_compute("ai_insights:a", compute, ttl=60, stale_ttl=30) == "old"
+    await drain(fake_redis)
+
+    assert compute.calls == 1
+    assert fake_redis.refresh_stats["early_refreshes"] == 1
+    assert await fake_redis.get("ai_insights:a") == "value-1"
+    assert not await fake_redis.exists("ai_insights:a:lease")
+
+
+async def test_stale_values_are_served_while_refreshing(fake_redis, rand):
+    await fake_redis.set_many({
+        "ai_insights:a": "old",
+        _xfetch_key("ai_insights:a"): {"delta": 0.0, "expiry": time.time() - 1},
+    }, ttl=30)
+    compute = Compute(delay=0.05)
+
+    results = await asyncio.gather(*[
+        fake_redis.get_or_compute("ai_insights:a", compute, ttl=60, stale_ttl=30) for _ in range(5)
+    ])
+    await drain(fake_redis)
+
+    assert results == ["old"] * 5
+    assert compute.calls == 1
+    assert fake_redis.refresh_stats["stale_served"] == 5
+    assert await fake_redis.get("ai_insights:a") == "value-1"
+
+
+async def test_failed_refresh_keeps_the_stale_value(fake_redis, rand):
+    await fake_redis.set_many({
+        "ai_insights:a": "old",
+        _xfetch_key("ai_insights:a"): {"delta": 0.0, "expiry": time.time() - 1},
+    }, ttl=30)
+
+    async def failing():
+        raise RuntimeError("model unavailable")
+
+    assert await fake_redis.get_or_compute("ai_insights:a", failing, ttl=60, stale_ttl=30) == "old"
+    await drain(fake_redis)
+    assert await fake_redis.get("ai_insights:a") == "old"
+    assert not await fake_redis.exists("ai_insights:a:lease")
+
+
+async def test_concurrent_misses_wait_for_the_lease_holder(fake_redis):
+    compute = Compute(delay=0.05)
+    results = await asyncio.gather(*[
+        fake_redis.get_or_compute("ai_insights:a", compute, ttl=60, poll_interval=0.01) for _ in range(5)
+    ])
+
+    assert results == ["value-1"] * 5
+    assert compute.calls == 1
+    assert fake_redis.refresh_stats["lease_waits"] == 4
+
+
+async def test_waiters_compute_when_the_lease_is_released_without_a_value(fake_redis):
+    token = await fake_redis.acquire_lock("ai_insights:a:lease", 30)
+    compute = Compute()
+
+    async def abandon():
+        await asyncio.sleep(0.03)
+        await fake_redis.release_lock("ai_insights:a:lease", token)
+
+    result, _ = await asyncio.gather(
+        fake_redis.get_or_compute("ai_insights:a", compute, ttl=60, poll_interval=0.01),
+        abandon()
+    )
+    assert result == "value-1"
+    assert compute.calls == 1
+
+
+async def test_plain_values_are_fresh_until_they_expire(fake_redis, rand):
+    await fake_redis.set("ai_insights:a", "plain", ttl=60)
+    compute = Compute()
+    assert await fake_redis.get_or_compute("ai_insights:a", compute, ttl=60) == "plain"
+    assert compute.calls == 0
+
+
+async def test_precomputed_values_carry_metadata(fake_redis, rand):
+    assert await fake_redis.store_computed({"ai_insights:a": "batch", "ai_insights:b": "batch"}, ttl=3600, stale_ttl=600, delta=2.0)
+
+    meta = await fake_redis.get(_xfetch_key("ai_insights:a"))
+    assert meta["delta"] == 2.0
+    assert meta["expiry"] == pytest.approx(time.time() + 3600, abs=2)
+    assert 3600 < await fake_redis.ttl("ai_insights:a") <= 4200
+
+    compute = Compute()
+    assert await fake_redis.get_or_compute("ai_insights:a", compute, ttl=3600, stale_ttl=600) == "batch"
+    assert compute.calls == 0
+
+
+async def test_fresh_ttl_excludes_the_stale_window(fake_redis):
+    await fake_redis.store_computed({"ai_insights:a": "batch"}, ttl=3600, stale_ttl=600)
+    await fake_redis.set("ai_insights:plain", "plain", ttl=120)
+    await fake_redis.set("ai_insights:forever", "plain")
+
+    ttls = await fake_redis.fresh_ttl_many(["ai_insights:a", "ai_insights:plain", "ai_insights:forever", "ai_insights:missing"])
+    assert ttls["ai_insights:a"] == pytest.approx(3600, abs=2)
+    assert ttls["ai_insights:plain"] == pytest.approx(120, abs=2)
+    assert ttls["ai_insights:forever"] == -1
+    assert ttls["ai_insights:missing"] == -2